@@ -0,0 +1,58 @@
+"""Compare two benchmark result files.
+
+Usage:
+    python benchmarks/compare.py BASELINE.json NEW.json [--threshold 0.10]
+
+Prints the median time of every benchmark in both files and the change.
+Exits with status 1 if any benchmark got slower by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+from harness import result_key
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report["meta"], {result_key(result): result for result in report["results"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown counted as a regression (default 0.10)")
+    options = parser.parse_args(argv)
+
+    old_meta, old = load(options.baseline)
+    new_meta, new = load(options.new)
+    print(f"baseline {old_meta.get('commit') or options.baseline}")
+    print(f"new      {new_meta.get('commit') or options.new}")
+
+    regressions = []
+    for key in sorted(old.keys() | new.keys()):
+        if key not in old or key not in new:
+            print(f"{key:<70} only in {'new' if key in new else 'baseline'}")
+            continue
+        before = old[key]["median"]
+        after = new[key]["median"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > options.threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif change < -options.threshold:
+            flag = "  faster"
+        print(f"{key:<70} {before * 1000:9.3f} ms -> {after * 1000:9.3f} ms  {change:+7.1%}{flag}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {options.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
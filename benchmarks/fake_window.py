@@ -0,0 +1,146 @@
+class FakeWindow:
+    """Stands in for a GraphWin: keeps canvas items in a dict instead of drawing.
+
+    Implements enough of the Tk canvas API for graphics.py objects and the
+    game's drawing code, so rendering can be timed without a visible window.
+    graphics.py itself still has to import, which needs a display.
+    """
+
+    def __init__(self, width=800, height=600, autoflush=False):
+        self.width = width
+        self.height = height
+        self.autoflush = autoflush
+        self.items = []  # Drawn graphics objects, like GraphWin.items
+        self.canvas_items = {}  # id -> [type, coords, options, tags]
+        self.tags = {}  # tag -> set of ids
+        self.next_id = 1
+        self.closed = False
+        self.ops = 0  # Canvas calls made, a rough measure of Tk work
+
+    # GraphWin methods used by graphics objects and the game
+    def isClosed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+    def getWidth(self):
+        return self.width
+
+    def getHeight(self):
+        return self.height
+
+    def toScreen(self, x, y):
+        return x, y
+
+    def toWorld(self, x, y):
+        return x, y
+
+    def addItem(self, item):
+        self.items.append(item)
+
+    def delItem(self, item):
+        self.items.remove(item)
+
+    def setBackground(self, color):
+        pass
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    # Tk canvas methods
+    def _create(self, item_type, args, kw):
+        self.ops += 1
+        options = dict(kw)
+        coords = []
+        for arg in args:
+            if isinstance(arg, dict):
+                options.update(arg)
+            else:
+                coords.append(arg)
+
+        item_id = self.next_id
+        self.next_id += 1
+        tags = options.pop("tags", ())
+        tags = {tags} if isinstance(tags, str) else set(tags)
+        self.canvas_items[item_id] = [item_type, coords, options, tags]
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(item_id)
+        return item_id
+
+    def create_rectangle(self, *args, **kw):
+        return self._create("rectangle", args, kw)
+
+    def create_oval(self, *args, **kw):
+        return self._create("oval", args, kw)
+
+    def create_line(self, *args, **kw):
+        return self._create("line", args, kw)
+
+    def create_polygon(self, *args, **kw):
+        return self._create("polygon", args, kw)
+
+    def create_text(self, *args, **kw):
+        return self._create("text", args, kw)
+
+    def create_image(self, *args, **kw):
+        return self._create("image", args, kw)
+
+    def _ids(self, tag):
+        if isinstance(tag, int):
+            return [tag] if tag in self.canvas_items else []
+        if tag == "all":
+            return list(self.canvas_items)
+        return list(self.tags.get(tag, ()))
+
+    def delete(self, *tags):
+        self.ops += 1
+        for tag in tags:
+            for item_id in self._ids(tag):
+                for item_tag in self.canvas_items.pop(item_id)[3]:
+                    self.tags[item_tag].discard(item_id)
+
+    def move(self, tag, dx, dy):
+        self.ops += 1
+        for item_id in self._ids(tag):
+            coords = self.canvas_items[item_id][1]
+            for i in range(0, len(coords) - 1, 2):
+                coords[i] += dx
+                coords[i + 1] += dy
+
+    def coords(self, tag, *coords):
+        self.ops += 1
+        ids = self._ids(tag)
+        if not coords:
+            return list(self.canvas_items[ids[0]][1]) if ids else []
+        if len(coords) == 1:
+            coords = coords[0]
+        for item_id in ids:
+            self.canvas_items[item_id][1] = list(coords)
+
+    def itemconfig(self, tag, cnf=None, **kw):
+        self.ops += 1
+        for item_id in self._ids(tag):
+            if cnf:
+                self.canvas_items[item_id][2].update(cnf)
+            self.canvas_items[item_id][2].update(kw)
+
+    itemconfigure = itemconfig
+
+    def addtag_withtag(self, new_tag, tag):
+        self.ops += 1
+        for item_id in self._ids(tag):
+            self.canvas_items[item_id][3].add(new_tag)
+            self.tags.setdefault(new_tag, set()).add(item_id)
+
+    def tag_raise(self, tag, above=None):
+        self.ops += 1
+
+    def tag_lower(self, tag, below=None):
+        self.ops += 1
+
+    def __len__(self):
+        return len(self.canvas_items)
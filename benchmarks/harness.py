@@ -0,0 +1,63 @@
+"""Timing and allocation measurement for the benchmark suites."""
+import gc
+import statistics
+import time
+import tracemalloc
+
+
+def measure(name, func, setup=None, repeat=7, number=1, items=None, **params):
+    """Time func and record what one call allocates.
+
+    setup() runs untimed before every repeat, and its result is passed to
+    func. Each repeat times number calls; the reported times are seconds per
+    call. items is how many operations one call performs (moves, shapes...),
+    used to report a throughput. params are stored with the result so runs
+    can be matched up between commits.
+    """
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # One untimed warm-up call fills caches and imports
+        func(setup() if setup else None)
+        for _ in range(repeat):
+            context = setup() if setup else None
+            start = time.perf_counter()
+            for _ in range(number):
+                func(context)
+            times.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # Allocations are traced in a separate call; tracing slows everything down
+    context = setup() if setup else None
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    func(context)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    result = {
+        "name": name,
+        "params": params,
+        "repeat": repeat,
+        "number": number,
+        "best": min(times),
+        "median": median,
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "alloc_peak_bytes": peak - before,
+        "alloc_retained_bytes": after - before,
+    }
+    if items:
+        result["items"] = items
+        result["items_per_second"] = items / median if median else None
+    return result
+
+
+def result_key(result):
+    """Identify a result across runs: its name plus its parameters."""
+    params = ",".join(f"{key}={value}" for key, value in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]" if params else result["name"]
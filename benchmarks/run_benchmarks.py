@@ -0,0 +1,291 @@
+"""Benchmarks for maze generation, shape drawing, maze drawing, movement and simulation.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--output FILE] [--quick] [--only NAME]
+
+Results are written as JSON (by default to benchmarks/results/<commit>.json)
+so two runs can be compared with benchmarks/compare.py. Benchmarks that
+need graphics.py are skipped, and listed as skipped, when there is no
+display to open its Tk root on.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np
+from config import GameConfig
+from game_state import build_maze, maze_size, new_game, random_playout, simulate_games
+from harness import measure
+
+PRESETS = ["easy", "medium", "hard"]
+CUSTOM_GRIDS = [(51, 51), (101, 101), (201, 201)]
+CIRCLE_RADII = [2, 5, 10, 20, 40]
+LINE_LENGTHS = [10, 50, 100, 400]
+MOVES = 1000
+SIMULATED_GAMES = 200
+SEED = 1234
+
+
+def graphics_error():
+    """Import graphics.py; return why it failed, or None if it works."""
+    try:
+        importlib.import_module("graphics")  # Opens the Tk root, so it fails without a display
+    except Exception as error:  # TclError when there is no display
+        return f"graphics.py unavailable: {error}"
+    return None
+
+
+def make_window(real_window):
+    """A FakeWindow, or a real GraphWin kept off screen."""
+    if real_window:
+        from graphics import GraphWin
+        window = GraphWin("Benchmark", GameConfig.WINDOW_WIDTH, GameConfig.WINDOW_HEIGHT,
+                          autoflush=False)
+        window.master.withdraw()
+        return window
+    from fake_window import FakeWindow
+    return FakeWindow(GameConfig.WINDOW_WIDTH, GameConfig.WINDOW_HEIGHT)
+
+
+def bench_generation(options):
+    """Maze._create_maze (build_maze) for each preset and larger custom grids."""
+    results = []
+    cases = []
+    for preset in PRESETS:
+        settings = GameConfig.DIFFICULTY_SETTINGS[preset]
+        rows, cols = maze_size(cell_size=settings["cell_size"])
+        cases.append((preset, rows, cols, settings["maze_algorithm"],
+                      settings["maze_complexity"], settings["coin_count"]))
+    grids = CUSTOM_GRIDS[:1] if options.quick else CUSTOM_GRIDS
+    for rows, cols in grids:
+        cases.append(("custom", rows, cols, "backtracker", 0.7, GameConfig.COIN_COUNT))
+
+    for preset, rows, cols, algorithm, complexity, coin_count in cases:
+        results.append(measure(
+            "create_maze",
+            lambda rng: build_maze(rows, cols, algorithm, complexity, coin_count, rng),
+            setup=lambda: random.Random(SEED),
+            repeat=options.repeat, number=5,
+            preset=preset, rows=rows, cols=cols, algorithm=algorithm))
+    return results
+
+
+def bench_shapes(options):
+    """draw_midpoint_circle and draw_bresenham_line at several sizes."""
+    from drawing_utils import draw_midpoint_circle, draw_bresenham_line
+
+    results = []
+    for radius in CIRCLE_RADII:
+        results.append(measure(
+            "draw_midpoint_circle",
+            lambda window: draw_midpoint_circle(window, 400, 300, radius, "gold", "black"),
+            setup=lambda: make_window(options.real_window),
+            repeat=options.repeat, number=20, radius=radius))
+    for length in LINE_LENGTHS:
+        results.append(measure(
+            "draw_bresenham_line",
+            lambda window: draw_bresenham_line(window, 0, 0, length, length // 2, "black"),
+            setup=lambda: make_window(options.real_window),
+            repeat=options.repeat, number=5, length=length))
+    return results
+
+
+def bench_framebuffer(options):
+    """The same circles and lines rasterized into a Framebuffer, and PNG export."""
+    from framebuffer import Framebuffer
+
+    def framebuffer():
+        return Framebuffer(GameConfig.WINDOW_WIDTH, GameConfig.WINDOW_HEIGHT)
+
+    results = []
+    for radius in CIRCLE_RADII:
+        results.append(measure(
+            "framebuffer_circle",
+            lambda fb: fb.circle(400, 300, radius, "gold", "black"),
+            setup=framebuffer, repeat=options.repeat, number=20, radius=radius))
+    for length in LINE_LENGTHS:
+        results.append(measure(
+            "framebuffer_line",
+            lambda fb: fb.line(0, 0, length, length // 2, "black"),
+            setup=framebuffer, repeat=options.repeat, number=5, length=length))
+    results.append(measure("framebuffer_png", lambda fb: fb.to_png(), setup=framebuffer,
+                           repeat=options.repeat))
+    return results
+
+
+def make_maze(difficulty, real_window, rows=None, cols=None):
+    """A seeded Maze for a preset (of rows x cols cells if given), attached to a benchmark window."""
+    from maze import Maze
+    from coins import CoinAnimator
+
+    GameConfig.apply_difficulty(difficulty)
+    GameConfig.MAZE_ROWS, GameConfig.MAZE_COLS = rows, cols
+    maze = Maze(seed=SEED)
+    GameConfig.MAZE_ROWS = GameConfig.MAZE_COLS = None
+    maze.window = make_window(real_window)
+    maze.coin_animator = CoinAnimator(maze.window, maze.cell_size / 3)
+    maze._create_score_display()
+    return maze
+
+
+def bench_draw_maze(options):
+    """Maze.draw_maze for each preset, and scrolling the view of larger custom grids."""
+    results = []
+    for preset in PRESETS:
+        results.append(measure(
+            "draw_maze",
+            lambda maze: maze.draw_maze(),
+            setup=lambda: make_maze(preset, options.real_window),
+            repeat=options.repeat, preset=preset))
+
+    # Only the view is drawn, so this should not grow with the grid
+    def scroll(maze):
+        for x in range(0, maze.maze_array.cols - maze.view_cols, 3):
+            maze.view_x = x
+            maze.draw_maze()
+
+    view_cols = maze_size(cell_size=GameConfig.DIFFICULTY_SETTINGS["medium"]["cell_size"])[1]
+    grids = CUSTOM_GRIDS[:1] if options.quick else CUSTOM_GRIDS
+    for rows, cols in grids:
+        results.append(measure(
+            "scroll_maze", scroll,
+            setup=lambda: make_maze("medium", options.real_window, rows, cols),
+            repeat=options.repeat, items=len(range(0, cols - view_cols, 3)),
+            preset="medium", rows=rows, cols=cols))
+    return results
+
+
+def bench_movement(options):
+    """Player.move through the GUI, and GameState.move headless."""
+    results = []
+
+    def random_moves(mover):
+        rng = random.Random(SEED)
+        directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+        for _ in range(MOVES):
+            mover.move(*rng.choice(directions))
+
+    if not options.skip_window:
+        from player import Player
+
+        def player_setup():
+            maze = make_maze("medium", options.real_window)
+            maze.draw_maze()
+            player = Player(maze)
+            player.draw()
+            return player
+
+        results.append(measure("player_move", random_moves, setup=player_setup,
+                               repeat=options.repeat, items=MOVES, preset="medium"))
+
+    def state_setup():
+        rows, cols = maze_size(cell_size=GameConfig.DIFFICULTY_SETTINGS["medium"]["cell_size"])
+        return new_game(rows, cols, rng=random.Random(SEED))
+
+    results.append(measure("game_state_move", random_moves, setup=state_setup,
+                           repeat=options.repeat, items=MOVES, preset="medium"))
+    results.append(measure(
+        "random_playout",
+        lambda state: random_playout(state, MOVES, random.Random(SEED)),
+        setup=state_setup, repeat=options.repeat, items=MOVES, preset="medium"))
+    return results
+
+
+def bench_simulation(options):
+    """simulate_games on the medium preset, with and without the solver checks."""
+    rows, cols = maze_size(cell_size=GameConfig.DIFFICULTY_SETTINGS["medium"]["cell_size"])
+    games = SIMULATED_GAMES // 4 if options.quick else SIMULATED_GAMES
+    results = []
+    for max_moves in (200, MOVES):
+        for validate in (True, False):
+            results.append(measure(
+                "simulate_games",
+                lambda _: simulate_games(games, max_moves, SEED, validate, rows=rows, cols=cols),
+                repeat=options.repeat, items=games, preset="medium",
+                max_moves=max_moves, validate=validate))
+    return results
+
+
+# name -> (function, needs graphics.py)
+SUITES = {
+    "generation": (bench_generation, False),
+    "shapes": (bench_shapes, True),
+    "framebuffer": (bench_framebuffer, False),
+    "draw_maze": (bench_draw_maze, True),
+    "movement": (bench_movement, False),
+    "simulation": (bench_simulation, False),
+}
+
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--repeat", type=int, default=7, help="timed repeats per benchmark")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and smaller grids")
+    parser.add_argument("--only", action="append", choices=sorted(SUITES),
+                        help="run only this suite (can be given more than once)")
+    parser.add_argument("--real-window", action="store_true",
+                        help="draw to a hidden GraphWin instead of a FakeWindow")
+    options = parser.parse_args(argv)
+    if options.quick:
+        options.repeat = min(options.repeat, 3)
+
+    options.skip_window = graphics_error()
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "window": "real" if options.real_window else "fake",
+            "quick": options.quick,
+        },
+        "results": [],
+        "skipped": [],
+    }
+
+    for name in options.only or SUITES:
+        func, needs_graphics = SUITES[name]
+        if needs_graphics and options.skip_window:
+            report["skipped"].append({"suite": name, "reason": options.skip_window})
+            print(f"{name}: skipped ({options.skip_window})")
+            continue
+        for result in func(options):
+            report["results"].append(result)
+            params = " ".join(f"{key}={value}" for key, value in result["params"].items())
+            rate = f"  {result['items_per_second']:10.0f}/s" if result.get("items") else ""
+            print(f"{result['name']:<22} {params:<50} {result['median'] * 1000:9.3f} ms"
+                  f"  peak {result['alloc_peak_bytes'] / 1024:8.1f} KiB{rate}")
+    if options.skip_window and "movement" in (options.only or SUITES):
+        report["skipped"].append({"benchmark": "player_move", "reason": options.skip_window})
+
+    output = options.output or os.path.join(
+        ROOT, "benchmarks", "results", f"{(commit or 'local')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
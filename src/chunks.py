@@ -0,0 +1,145 @@
+"""Effectively unbounded mazes built from lazily generated chunks."""
+import hashlib
+import random
+import struct
+from collections import OrderedDict
+import numpy as np
+from config import GameConfig, CellType
+from generators import get_generator
+from utils.grid_utils import MazeGrid
+
+
+class ChunkedMaze:
+    """An endless maze split into square chunks of cells.
+
+    Each chunk is generated on first access from a seed derived from its
+    chunk coordinates, so the same chunk always comes back identical after
+    being evicted, except for the coins already collected in it, which are
+    remembered per chunk. Every chunk owns the wall along its top and left edge and
+    opens one door in each, which keeps the whole world connected without
+    chunks ever needing to look at their neighbours.
+
+    Offers the same cell accessors as MazeGrid, so Player can move through
+    it unchanged.
+    """
+
+    def __init__(self, seed, chunk_size=None, keep_radius=None,
+                 algorithm="backtracker", complexity=0.7, coins_per_chunk=None):
+        self.seed = seed
+        self.chunk_size = chunk_size or GameConfig.CHUNK_SIZE
+        if self.chunk_size % 2 or self.chunk_size < 4:
+            raise ValueError("chunk_size must be an even number of at least 4")
+        self.keep_radius = GameConfig.CHUNK_KEEP_RADIUS if keep_radius is None else keep_radius
+        self.coins_per_chunk = (GameConfig.CHUNK_COIN_COUNT if coins_per_chunk is None
+                                else coins_per_chunk)
+        self.generate = get_generator(algorithm)
+        self.complexity = complexity
+        # Loaded chunks by (chunk_x, chunk_y), least recently used first
+        self.chunks = OrderedDict()
+        # (chunk_x, chunk_y) -> set of (x, y) chunk cells whose coin was
+        # collected; kept after eviction so coins never respawn
+        self.collected = {}
+
+    def chunk_seed(self, chunk_x, chunk_y):
+        """Deterministic seed for one chunk."""
+        data = struct.pack("<Qqq", self.seed & 0xFFFFFFFFFFFFFFFF, chunk_x, chunk_y)
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+    def _generate_chunk(self, chunk_x, chunk_y):
+        """Build one chunk from its seed."""
+        size = self.chunk_size
+        rng = random.Random(self.chunk_seed(chunk_x, chunk_y))
+        cells = MazeGrid.from_buffer(self.generate(size, size, self.complexity, rng), size, size)
+
+        # Doors through the chunk's own top and left walls onto odd cells
+        path = CellType.PATH.value
+        cells.set(0, rng.randrange(1, size, 2), path)
+        cells.set(rng.randrange(1, size, 2), 0, path)
+
+        if chunk_x == 0 and chunk_y == 0:
+            cells.set(1, 1, CellType.START.value)
+
+        # Scatter this chunk's coins
+        empty_cells = cells.empty_cells()
+        if len(empty_cells):
+            picks = rng.sample(range(len(empty_cells)), min(self.coins_per_chunk, len(empty_cells)))
+            for x, y in empty_cells[picks].tolist():
+                cells.set(x, y, CellType.COIN.value)
+
+        # Coins taken before this chunk was last evicted stay taken
+        for x, y in self.collected.get((chunk_x, chunk_y), ()):
+            cells.set(x, y, CellType.PATH.value)
+        return cells
+
+    def chunk(self, chunk_x, chunk_y):
+        """Return a chunk, generating it if it is not loaded."""
+        key = (chunk_x, chunk_y)
+        cells = self.chunks.get(key)
+        if cells is None:
+            cells = self._generate_chunk(chunk_x, chunk_y)
+            self.chunks[key] = cells
+        else:
+            self.chunks.move_to_end(key)
+        return cells
+
+    def focus(self, x, y):
+        """Load the chunks around (x, y) and evict those far behind."""
+        size = self.chunk_size
+        center_x, center_y = x // size, y // size
+
+        for key in list(self.chunks):
+            if (abs(key[0] - center_x) > self.keep_radius or
+                    abs(key[1] - center_y) > self.keep_radius):
+                del self.chunks[key]
+
+        # Preload the neighbouring chunks the player is about to reach
+        for chunk_y in range(center_y - 1, center_y + 2):
+            for chunk_x in range(center_x - 1, center_x + 2):
+                self.chunk(chunk_x, chunk_y)
+
+    def in_bounds(self, x, y):
+        """Every cell exists in an endless maze."""
+        return True
+
+    def get(self, x, y):
+        """Return the cell value at (x, y)."""
+        size = self.chunk_size
+        return self.chunk(x // size, y // size).get(x % size, y % size)
+
+    def set(self, x, y, value):
+        """Set the cell value at (x, y) in its loaded chunk.
+
+        Replacing a coin records it as collected, so it stays gone when the
+        chunk is regenerated.
+        """
+        size = self.chunk_size
+        key = (x // size, y // size)
+        cells = self.chunk(*key)
+        local = (x % size, y % size)
+        if cells.get(*local) == CellType.COIN.value and value != CellType.COIN.value:
+            self.collected.setdefault(key, set()).add(local)
+        cells.set(*local, value)
+
+    def find_start(self):
+        """The START cell always sits in chunk (0, 0)."""
+        return (1, 1)
+
+    def find_end(self):
+        """Endless mazes have no END."""
+        return None
+
+    def region(self, x, y, width, height):
+        """Return a (height, width) uint8 array of cells starting at (x, y)."""
+        size = self.chunk_size
+        out = np.empty((height, width), dtype=np.uint8)
+        for chunk_y in range(y // size, (y + height - 1) // size + 1):
+            for chunk_x in range(x // size, (x + width - 1) // size + 1):
+                cells = self.chunk(chunk_x, chunk_y).cells
+                # Overlap of this chunk with the requested window, in world cells
+                x0 = max(x, chunk_x * size)
+                x1 = min(x + width, (chunk_x + 1) * size)
+                y0 = max(y, chunk_y * size)
+                y1 = min(y + height, (chunk_y + 1) * size)
+                out[y0 - y:y1 - y, x0 - x:x1 - x] = cells[y0 - chunk_y * size:y1 - chunk_y * size,
+                                                          x0 - chunk_x * size:x1 - chunk_x * size]
+        return out
@@ -0,0 +1,76 @@
+from graphics import *
+from config import GameConfig
+from drawing_utils import MidpointCircle
+
+
+class CoinAnimator:
+    """Owns the drawn coins: one persistent circle per coin cell.
+
+    Coins are pulsed by resizing their circles in place from a fixed base
+    radius. A collected coin's circle is hidden and kept for reuse by the
+    next coin added, so the number of canvas items never grows while the
+    game runs.
+    """
+
+    def __init__(self, window, radius):
+        """Create an empty animator drawing coins of radius on window."""
+        self.window = window
+        self.radius = radius
+        self.scale = 1
+        self.visuals = {}  # (x, y) maze cell -> MidpointCircle
+        self.spare = []  # Hidden circles ready for reuse
+
+    def add(self, position, center):
+        """Show a coin for maze cell position centered on center."""
+        if self.spare:
+            coin = self.spare.pop()
+            old_center = coin.getCenter()
+            coin.move(center.getX() - old_center.getX(), center.getY() - old_center.getY())
+            coin.setRadius(self.radius * self.scale)
+            self._set_hidden(coin, False)
+        else:
+            coin = MidpointCircle(center, self.radius * self.scale)
+            coin.setFill(GameConfig.COLORS["coin"])
+            coin.setOutline("gold")
+            coin.draw(self.window)
+        self.visuals[position] = coin
+        return coin
+
+    def remove(self, position):
+        """Hide the coin on maze cell position, if one is shown."""
+        coin = self.visuals.pop(position, None)
+        if coin:
+            self._set_hidden(coin, True)
+            self.spare.append(coin)
+        return coin
+
+    def clear(self):
+        """Hide every coin."""
+        for position in list(self.visuals):
+            self.remove(position)
+
+    def _set_hidden(self, coin, hidden):
+        """Hide or show a drawn coin in place"""
+        if not self.window.isClosed():
+            self.window.itemconfig(coin.tag, state="hidden" if hidden else "normal")
+
+    def pulse(self, scale):
+        """Scale every coin to scale times the base radius.
+
+        Returns the coins whose outline changed on screen.
+        """
+        self.scale = scale
+        radius = self.radius * scale
+        changed = []
+        for coin in self.visuals.values():
+            # setRadius only touches the canvas on whole-pixel changes
+            if int(coin.getRadius()) != int(radius):
+                changed.append(coin)
+            coin.setRadius(radius)
+        return changed
+
+    def __contains__(self, position):
+        return position in self.visuals
+
+    def __len__(self):
+        return len(self.visuals)
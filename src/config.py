@@ -20,6 +20,38 @@ class GameConfig:
     COIN_COUNT = 10
     PLAYER_COLOR = "blue"
 
+    # Maze generation algorithm; None uses the difficulty preset's choice.
+    # See generators.GENERATORS for the available names.
+    MAZE_ALGORITHM = None
+    MAZE_POOL_SIZE = 2  # Mazes generated ahead per difficulty, in a worker process
+
+    # Maze size in cells; None fits the maze to the window. Bigger mazes
+    # scroll: the camera follows the player, keeping CAMERA_MARGIN cells
+    # between them and the window edge, and only the view plus VIEW_MARGIN
+    # cells around it is rendered at a time.
+    MAZE_ROWS = None
+    MAZE_COLS = None
+    CAMERA_MARGIN = 3
+    VIEW_MARGIN = 8
+
+    # Infinite mode: the maze is generated in chunks around the player
+    INFINITE_MODE = False
+    CHUNK_SIZE = 16  # Cells per chunk side, must be even
+    CHUNK_KEEP_RADIUS = 2  # Chunks kept loaded around the player's chunk
+    CHUNK_COIN_COUNT = 3
+
+    # Tint for path cells the player has walked over; None leaves them as they are
+    VISITED_COLOR = None
+
+    # Reveal the maze row by row when it is first drawn
+    PROGRESSIVE_REVEAL = False
+    REVEAL_TIME = 0.5  # Seconds the reveal may take at most
+
+    # Game loop pacing
+    TARGET_FPS = 60
+    COIN_PULSE_FPS = 12  # Coin pulse animation updates per second
+    EFFECT_FRAME_BUDGET = 0.004  # Seconds of effect animation work per frame
+
     # Points per coin
     POINTS_PER_COIN = 10
 
@@ -38,17 +70,23 @@ class GameConfig:
         "easy": {
             "cell_size": 50,
             "coin_count": 5,
-            "maze_complexity": 0.5
+            "maze_complexity": 0.5,
+            "maze_algorithm": "backtracker",
+            "coin_detour": 4
         },
         "medium": {
             "cell_size": 40,
             "coin_count": 10,
-            "maze_complexity": 0.7
+            "maze_complexity": 0.7,
+            "maze_algorithm": "backtracker",
+            "coin_detour": 8
         },
         "hard": {
             "cell_size": 30,
             "coin_count": 15,
-            "maze_complexity": 0.9
+            "maze_complexity": 0.9,
+            "maze_algorithm": "backtracker",
+            "coin_detour": 16
         }
     }
 
@@ -64,6 +102,8 @@ class GameConfig:
             "cell_size": cls.CELL_SIZE,
             "difficulty": cls.DIFFICULTY,
             "player_color": cls.PLAYER_COLOR,
+            "maze_algorithm": cls.MAZE_ALGORITHM,
+            "infinite_mode": cls.INFINITE_MODE,
             "colors": cls.COLORS
         }
         with open(filename, 'w') as f:
@@ -81,6 +121,10 @@ class GameConfig:
                     cls.DIFFICULTY = config["difficulty"]
                 if "player_color" in config:
                     cls.PLAYER_COLOR = config["player_color"]
+                if "maze_algorithm" in config:
+                    cls.MAZE_ALGORITHM = config["maze_algorithm"]
+                if "infinite_mode" in config:
+                    cls.INFINITE_MODE = config["infinite_mode"]
                 cls.COLORS = config["colors"]
         except FileNotFoundError:
             print("Config file not found, using default settings")
@@ -1,98 +1,127 @@
 from graphics import *
+from raster import circle_outline, bresenham_lines, pixel_runs, polygon_spans, merge_spans
+from collections import OrderedDict
+import itertools
+import numpy as np
 
 
-def draw_midpoint_circle(window, center_x, center_y, radius, fill_color, outline_color=None, width=1):
-    """Draw circle using midpoint algorithm (efficient integer math)."""
-    # If no outline color specified, use the fill color
-    if outline_color is None:
-        outline_color = fill_color
+class SpriteCache:
+    """LRU cache of rasterized shapes, keyed by size and style.
 
-    # Initialize lists to store all points
-    points = []
+    Shapes are rasterized around (0, 0) once per key and reused by
+    translating them to where they are drawn.
+    """
 
-    # Convert radius to integer for the algorithm
-    radius_int = int(radius)
-    if radius_int < 1:
-        radius_int = 1
+    def __init__(self, maxsize=128):
+        """Create an empty cache holding at most maxsize sprites."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
 
-    # Initial point
-    x = 0
-    y = radius_int
+    def get(self, key, build):
+        """Return the sprite for key, calling build() to make it on a miss."""
+        sprite = self.entries.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return sprite
 
-    # Initial decision parameter
-    p = 1 - radius_int
+        self.misses += 1
+        sprite = build()
+        self.entries[key] = sprite
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return sprite
 
-    # Store the 8-way symmetric points
-    plot_circle_points(window, center_x, center_y, x, y, fill_color, outline_color, width, points)
+    def info(self):
+        """Return hit/miss counters and current size, for sizing the cache."""
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.entries), "maxsize": self.maxsize}
 
-    # Midpoint circle algorithm
-    while x < y:
-        x += 1
+    def clear(self):
+        """Drop all sprites and reset the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
 
-        # Update decision parameter
-        if p < 0:
-            p += 2 * x + 1
-        else:
-            y -= 1
-            p += 2 * (x - y) + 1
+    def __len__(self):
+        return len(self.entries)
 
-        # Plot the points in all octants
-        plot_circle_points(window, center_x, center_y, x, y, fill_color, outline_color, width, points)
 
-    # Fill the circle
-    fill_circle(window, center_x, center_y, radius, fill_color, points)
+# Rasterized circle outlines shared by every MidpointCircle
+circle_sprites = SpriteCache()
+
+
+def circle_sprite(radius, fill_color, outline_color, width):
+    """Cached circle outline offsets for the given radius and style."""
+    radius_int = max(1, int(radius))
+    key = (radius_int, fill_color, outline_color, width)
+    return circle_sprites.get(key, lambda: tuple(circle_outline(radius_int)))
 
-    return points
 
-def plot_circle_points(window, center_x, center_y, x, y, fill_color, outline_color, width, points_list):
-    """Plot points in all 8 octants of the circle."""
-    # Plot points in all 8 octants
-    plot_point(window, center_x + x, center_y + y, outline_color, width, points_list)
-    plot_point(window, center_x - x, center_y + y, outline_color, width, points_list)
-    plot_point(window, center_x + x, center_y - y, outline_color, width, points_list)
-    plot_point(window, center_x - x, center_y - y, outline_color, width, points_list)
-    plot_point(window, center_x + y, center_y + x, outline_color, width, points_list)
-    plot_point(window, center_x - y, center_y + x, outline_color, width, points_list)
-    plot_point(window, center_x + y, center_y - x, outline_color, width, points_list)
-    plot_point(window, center_x - y, center_y - x, outline_color, width, points_list)
+def draw_midpoint_circle(window, center_x, center_y, radius, fill_color, outline_color=None, width=1):
+    """Draw circle using midpoint algorithm as one filled polygon canvas item."""
+    # If no outline color specified, use the fill color
+    if outline_color is None:
+        outline_color = fill_color
 
-def plot_point(window, x, y, color, width, points_list):
-    """Draw a single pixel."""
-    # Create a small rectangle to represent a pixel
-    pixel = Rectangle(Point(x - width/2, y - width/2), Point(x + width/2, y + width/2))
-    pixel.setFill(color)
-    pixel.setOutline(color)
-    pixel.draw(window)
+    # The cached outline pixels, moved to the center, become the polygon's vertices
+    outline = circle_sprite(radius, fill_color, outline_color, width)
+    vertices = [Point(center_x + x, center_y + y) for x, y in outline]
+    circle = Polygon(vertices)
+    circle.setFill(fill_color)
+    circle.setOutline(outline_color)
+    circle.setWidth(width)
+    circle.draw(window)
+
+    return [circle]
+
+def draw_spans(window, ys, lefts, rights, color, points_list=None):
+    """Draw scanline spans as filled rectangles.
+
+    Identical spans on consecutive rows are stacked into one rectangle,
+    so a shape costs as few canvas items as possible. Returns the list of
+    drawn rectangles (points_list, if given, is extended and returned).
+    """
+    points = [] if points_list is None else points_list
+    lefts, tops, rights, bottoms, _ = merge_spans(ys, lefts, rights)
+    for left, top, right, bottom in zip(lefts.tolist(), tops.tolist(),
+                                        rights.tolist(), bottoms.tolist()):
+        span = Rectangle(Point(left, top), Point(right, bottom))
+        span.setFill(color)
+        span.setOutline(color)
+        span.draw(window)
+        points.append(span)
+    return points
 
-    # Add the point to the list
-    points_list.append(pixel)
 
-def fill_circle(window, center_x, center_y, radius, fill_color, outline_points):
-    """Fill circle using scan lines."""
-    # Convert to integers for range operations
-    center_x_int = int(center_x)
-    center_y_int = int(center_y)
-    radius_int = int(radius)
+def fill_polygon(window, vertices, fill_color, points_list=None):
+    """Fill a polygon given as (x, y) vertices using the scanline fill."""
+    return draw_spans(window, *polygon_spans(vertices), fill_color, points_list)
 
-    step = max(1, radius_int // 10)
 
+# Unique canvas tags for shapes made of several canvas items
+_shape_tags = itertools.count(1)
 
-    for y in range(center_y_int - radius_int + 1, center_y_int + radius_int, step):
-        # Calculate x bounds for this y
-        dy = y - center_y
-        dx = int((radius**2 - dy**2)**0.5) if (radius**2 - dy**2) > 0 else 0
 
+def tag_items(window, items):
+    """Group drawn graphics objects under one new canvas tag and return the tag."""
+    tag = f"shape{next(_shape_tags)}"
+    for item in items:
+        window.addtag_withtag(tag, item.id)
+    return tag
 
-        left_x = center_x_int - dx + 1
-        right_x = center_x_int + dx - 1
 
-        if right_x > left_x:
+def move_items(window, tag, items, dx, dy):
+    """Move a tagged group of graphics objects with a single canvas call."""
+    # Keep each object's own coordinates in sync without touching the canvas
+    for item in items:
+        item._move(dx, dy)
+    window.move(tag, dx, dy)
+    if window.autoflush:
+        update()
 
-            fill_rect = Rectangle(Point(left_x, y), Point(right_x, y + step - 1))
-            fill_rect.setFill(fill_color)
-            fill_rect.setOutline(fill_color)
-            fill_rect.draw(window)
-            outline_points.append(fill_rect)
 
 class MidpointCircle:
     """Circle drawn using midpoint algorithm. More efficient than standard Circle."""
@@ -106,6 +135,7 @@ class MidpointCircle:
         self.width = 1
         self.canvas = None
         self.points = []
+        self.tag = None
 
     def draw(self, window):
         """Draw circle on window."""
@@ -119,6 +149,7 @@ class MidpointCircle:
             self.outline_color,
             self.width
         )
+        self.tag = tag_items(window, self.points)
         return self
 
     def undraw(self):
@@ -131,11 +162,16 @@ class MidpointCircle:
     def setFill(self, color):
         """Set the fill color of the circle."""
         self.fill_color = color
+        # Recolor a drawn circle in place
+        for point in self.points:
+            point.setFill(color)
         return self
 
     def setOutline(self, color):
         """Set the outline color of the circle."""
         self.outline_color = color
+        for point in self.points:
+            point.setOutline(color)
         return self
 
     def setWidth(self, width):
@@ -151,6 +187,26 @@ class MidpointCircle:
         """Return the radius of the circle."""
         return self.radius
 
+    def setRadius(self, radius):
+        """Change the radius, reshaping a drawn circle in place."""
+        old_radius = self.radius
+        self.radius = radius
+
+        # Only whole-pixel radius changes alter the rasterized outline
+        if self.canvas and max(1, int(radius)) != max(1, int(old_radius)):
+            polygon = self.points[0]
+            outline = circle_sprite(radius, self.fill_color, self.outline_color, self.width)
+            center_x, center_y = self.center.getX(), self.center.getY()
+            polygon.points = [Point(center_x + x, center_y + y) for x, y in outline]
+
+            coords = []
+            for point in polygon.points:
+                coords.extend(self.canvas.toScreen(point.getX(), point.getY()))
+            self.canvas.coords(polygon.id, *coords)
+            if self.canvas.autoflush:
+                update()
+        return self
+
     def move(self, dx, dy):
         """Move the circle by the given amount."""
         # Update the center point
@@ -158,68 +214,49 @@ class MidpointCircle:
         new_y = self.center.getY() + dy
         self.center = Point(new_x, new_y)
 
-        # If the circle is drawn, redraw it at the new position
+        # If the circle is drawn, shift its canvas item in place
         if self.canvas:
-            # Store the canvas before undrawing
-            canvas = self.canvas
-            self.undraw()
-            # Use the stored canvas reference
-            self.draw(canvas)
+            move_items(self.canvas, self.tag, self.points, dx, dy)
 
         return self
 
 
-def draw_bresenham_line(window, x1, y1, x2, y2, color, width=1):
-    """Draw line using Bresenham algorithm (fast integer math)."""
-    # Initialize list to store all points
-    points = []
-
-    # Calculate differences
-    dx = abs(x2 - x1)
-    dy = abs(y2 - y1)
-
-    # Determine direction of movement
-    sx = 1 if x1 < x2 else -1
-    sy = 1 if y1 < y2 else -1
-
-    # Initial error
-    err = dx - dy
+def plot_runs(window, runs, color, width, points_list):
+    """Draw pixel runs from raster.pixel_runs, one rectangle per run."""
+    lefts, tops, rights, bottoms, _ = runs
+    for left, top, right, bottom in zip(lefts.tolist(), tops.tolist(),
+                                        rights.tolist(), bottoms.tolist()):
+        run = Rectangle(Point(left - width/2, top - width/2), Point(right + width/2, bottom + width/2))
+        run.setFill(color)
+        run.setOutline(color)
+        run.draw(window)
+        points_list.append(run)
 
-    # Current position
-    x, y = x1, y1
 
-    # Bresenham algorithm
-    while True:
-        # Plot the current point
-        plot_point(window, x, y, color, width, points)
+def draw_bresenham_lines(window, endpoints, color, width=1):
+    """Draw many lines using the batched Bresenham kernel.
 
-        # Check if we've reached the end point
-        if x == x2 and y == y2:
-            break
+    endpoints is a sequence of (x1, y1, x2, y2). All pixels come from one
+    kernel call, and each straight run of pixels is drawn as a single
+    rectangle instead of one per pixel.
+    """
+    points = []
+    if len(endpoints):
+        x1s, y1s, x2s, y2s = np.asarray(endpoints, dtype=np.float64).reshape(-1, 4).T
+        plot_runs(window, pixel_runs(*bresenham_lines(x1s, y1s, x2s, y2s)), color, width, points)
+    return points
 
-        # Calculate error for next step
-        e2 = 2 * err
-        if e2 > -dy:
-            err -= dy
-            x += sx
-        if e2 < dx:
-            err += dx
-            y += sy
 
-    return points
+def draw_bresenham_line(window, x1, y1, x2, y2, color, width=1):
+    """Draw line using Bresenham algorithm (fast integer math)."""
+    return draw_bresenham_lines(window, [(x1, y1, x2, y2)], color, width)
 
 
 def draw_rectangle_border(window, x1, y1, x2, y2, color, width=1):
     """Draw rectangle border using Bresenham lines for clean edges."""
-    points = []
-
-    # Draw the four sides of the rectangle
-    points.extend(draw_bresenham_line(window, x1, y1, x2, y1, color, width))  # Top
-    points.extend(draw_bresenham_line(window, x2, y1, x2, y2, color, width))  # Right
-    points.extend(draw_bresenham_line(window, x2, y2, x1, y2, color, width))  # Bottom
-    points.extend(draw_bresenham_line(window, x1, y2, x1, y1, color, width))  # Left
-
-    return points
+    # Top, right, bottom and left sides in one batch
+    return draw_bresenham_lines(window, [(x1, y1, x2, y1), (x2, y1, x2, y2),
+                                         (x2, y2, x1, y2), (x1, y2, x1, y1)], color, width)
 
 
 class BresenhamLine:
@@ -233,6 +270,7 @@ class BresenhamLine:
         self.width = 1
         self.canvas = None
         self.points = []
+        self.tag = None
 
     def draw(self, window):
         """Draw the line on the window."""
@@ -246,6 +284,7 @@ class BresenhamLine:
             self.color,
             self.width
         )
+        self.tag = tag_items(window, self.points)
         return self
 
     def undraw(self):
@@ -258,6 +297,13 @@ class BresenhamLine:
     def setFill(self, color):
         """Set the color of the line."""
         self.color = color
+        # Recolor every pixel of a drawn line with one canvas call
+        if self.canvas and not self.canvas.isClosed():
+            for point in self.points:
+                point.config["fill"] = point.config["outline"] = color
+            self.canvas.itemconfig(self.tag, fill=color, outline=color)
+            if self.canvas.autoflush:
+                update()
         return self
 
     def setOutline(self, color):
@@ -277,6 +323,71 @@ class BresenhamLine:
         """Return the end point of the line."""
         return self.point2
 
+    def move(self, dx, dy):
+        """Move the line by the given amount."""
+        self.point1 = Point(self.point1.getX() + dx, self.point1.getY() + dy)
+        self.point2 = Point(self.point2.getX() + dx, self.point2.getY() + dy)
+
+        # If the line is drawn, shift its pixels in place
+        if self.canvas:
+            move_items(self.canvas, self.tag, self.points, dx, dy)
+
+        return self
+
+
+class BresenhamLines:
+    """Many Bresenham lines of one color, rasterized and recolored together."""
+
+    def __init__(self, endpoints):
+        """Create lines from a sequence of (x1, y1, x2, y2) endpoints."""
+        self.endpoints = [tuple(line) for line in endpoints]
+        self.color = "black"
+        self.width = 1
+        self.canvas = None
+        self.points = []
+        self.tag = None
+
+    def draw(self, window):
+        """Draw all the lines on the window with one kernel call."""
+        self.canvas = window
+        self.points = draw_bresenham_lines(window, self.endpoints, self.color, self.width)
+        self.tag = tag_items(window, self.points)
+        return self
+
+    def undraw(self):
+        """Remove the lines from the window."""
+        if self.canvas:
+            for point in self.points:
+                point.undraw()
+            self.canvas = None
+
+    def setFill(self, color):
+        """Set the color of every line with one canvas call."""
+        self.color = color
+        if self.canvas and not self.canvas.isClosed():
+            for point in self.points:
+                point.config["fill"] = point.config["outline"] = color
+            self.canvas.itemconfig(self.tag, fill=color, outline=color)
+            if self.canvas.autoflush:
+                update()
+        return self
+
+    def setOutline(self, color):
+        """Set the color of the lines (alias for setFill)."""
+        return self.setFill(color)
+
+    def setWidth(self, width):
+        """Set the width of the lines."""
+        self.width = width
+        return self
+
+    def move(self, dx, dy):
+        """Move all the lines by the given amount."""
+        self.endpoints = [(x1 + dx, y1 + dy, x2 + dx, y2 + dy) for x1, y1, x2, y2 in self.endpoints]
+        if self.canvas:
+            move_items(self.canvas, self.tag, self.points, dx, dy)
+        return self
+
 
 class BresenhamRectangle:
     """Rectangle with precise edges using Bresenham algorithm."""
@@ -290,18 +401,19 @@ class BresenhamRectangle:
         self.width = 1
         self.canvas = None
         self.points = []
-        self.fill_rectangle = None
+        self.fill_spans = []
+        self.tag = None
 
     def draw(self, window):
         """Draw the rectangle on the window."""
         self.canvas = window
 
-        # Draw fill if specified
+        # Draw fill if specified, through the scanline fill
         if self.fill_color:
-            self.fill_rectangle = Rectangle(self.point1, self.point2)
-            self.fill_rectangle.setFill(self.fill_color)
-            self.fill_rectangle.setOutline(self.fill_color)
-            self.fill_rectangle.draw(window)
+            x1, y1 = self.point1.getX(), self.point1.getY()
+            x2, y2 = self.point2.getX(), self.point2.getY()
+            self.fill_spans = fill_polygon(window, [(x1, y1), (x2, y1), (x2, y2), (x1, y2)],
+                                           self.fill_color)
 
         # Draw border using Bresenham lines
         self.points = draw_rectangle_border(
@@ -313,14 +425,17 @@ class BresenhamRectangle:
             self.outline_color,
             self.width
         )
+        self.tag = tag_items(window, self._items())
         return self
 
+    def _items(self):
+        """All graphics objects making up the drawn rectangle."""
+        return self.fill_spans + self.points
+
     def undraw(self):
         """Remove the rectangle from the window."""
         if self.canvas:
-            if self.fill_rectangle:
-                self.fill_rectangle.undraw()
-            for point in self.points:
+            for point in self._items():
                 point.undraw()
             self.canvas = None
 
@@ -346,3 +461,14 @@ class BresenhamRectangle:
     def getP2(self):
         """Return the bottom-right corner of the rectangle."""
         return self.point2
+
+    def move(self, dx, dy):
+        """Move the rectangle by the given amount."""
+        self.point1 = Point(self.point1.getX() + dx, self.point1.getY() + dy)
+        self.point2 = Point(self.point2.getX() + dx, self.point2.getY() + dy)
+
+        # If the rectangle is drawn, shift its fill and border in place
+        if self.canvas:
+            move_items(self.canvas, self.tag, self._items(), dx, dy)
+
+        return self
@@ -1,13 +1,67 @@
-import time
 import random
 import math
+import time
 from graphics import *
 from config import GameConfig
-from drawing_utils import MidpointCircle, BresenhamLine
+from drawing_utils import MidpointCircle, BresenhamLines
+from framebuffer import Framebuffer
+from timeline import Timeline
+import numpy as np
+
+
+class Fireworks:
+    """Firework particle lines, each with its own color, drawn as one image.
+
+    Every render rasterizes all particles with one batched Bresenham call
+    into a framebuffer and updates the window with a single image.
+    """
+
+    def __init__(self, window, background="black", width=2):
+        self.window = window
+        self.width = width
+        self.framebuffer = Framebuffer(window.getWidth(), window.getHeight(), background)
+        self.endpoints = []
+        self.colors = []
+
+    def add_particle(self, x1, y1, x2, y2, color):
+        """Add a particle line; color is an (r, g, b) tuple of 0-1 floats."""
+        self.endpoints.append((x1, y1, x2, y2))
+        self.colors.append(tuple(int(c * 255) for c in color) + (255,))
+
+    def recolor(self, rng=random):
+        """Give every particle a new random color."""
+        self.colors = [(rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+                       for _ in self.colors]
+
+    def render(self):
+        """Rasterize every particle and show the frame."""
+        self.framebuffer.clear()
+        self.framebuffer.lines(self.endpoints, np.array(self.colors, dtype=np.uint8).reshape(-1, 4),
+                               self.width)
+        if not self.window.isClosed():
+            self.framebuffer.present(self.window, below=True)
+
+    def undraw(self):
+        """Remove the fireworks from the window."""
+        self.framebuffer.hide()
+
 
 class Effects:
-    def __init__(self):
+    """Visual effects, animated by a Timeline instead of blocking loops.
+
+    Every method returns as soon as its objects are drawn; the animation
+    runs as the game loop ticks the timeline.
+    """
+
+    def __init__(self, timeline=None):
         self.window = None
+        self.timeline = Timeline() if timeline is None else timeline
+        self.scheduler = None  # FrameScheduler to report changes to, if any
+
+    def mark_dirty(self):
+        """Tell the frame scheduler the window changed"""
+        if self.scheduler:
+            self.scheduler.mark_dirty()
 
     def victory_effect(self):
         """Show victory animation with graphics library"""
@@ -28,12 +82,19 @@ class Effects:
         # Add some graphical effects using our custom algorithms
         self._add_victory_effects(self.window)
 
-        # Wait and close
-        time.sleep(3)
+        # The game loop has ended by now, so nothing else ticks the timeline:
+        # keep running effects animated here and close after 3 seconds
+        end = time.perf_counter() + 3
+        while time.perf_counter() < end and not self.window.isClosed():
+            self.timeline.tick()
+            self.window.update()
+            time.sleep(1 / GameConfig.TARGET_FPS)
         self.window.close()
 
     def _add_victory_effects(self, window):
         """Add graphical effects to victory screen using graphics library"""
+        rays = []
+
         # Create sparkles around the text
         for i in range(8):
             angle = 2 * math.pi * i / 8
@@ -46,19 +107,23 @@ class Effects:
             sparkle.setOutline("gold")
             sparkle.draw(window)
 
-            # Create rays using BresenhamLine
+            # Rays of every sparkle are rasterized together below
             for j in range(4):
                 ray_angle = angle + j * math.pi/4
-                end_x = x + 15 * math.cos(ray_angle)
-                end_y = y + 15 * math.sin(ray_angle)
+                rays.append((x, y, x + 15 * math.cos(ray_angle), y + 15 * math.sin(ray_angle)))
+
+        ray_lines = BresenhamLines(rays)
+        ray_lines.color = "gold"
+        ray_lines.draw(window)
 
-                ray = BresenhamLine(Point(x, y), Point(end_x, end_y))
-                ray.color = "gold"
-                ray.draw(window)
+    def create_fireworks(self, window, num_fireworks=10, background="black"):
+        """Make colorful fireworks for victory screen using Bresenham lines.
 
-    def create_fireworks(self, window, num_fireworks=10):
-        """Make colorful fireworks for victory screen using Bresenham lines."""
-        fireworks = []
+        The particle lines of all fireworks are rasterized together into a
+        framebuffer shown as one image, drawn under the window's other items
+        on the given background color.
+        """
+        fireworks = Fireworks(window, background)
 
         for _ in range(num_fireworks):
             # Random position
@@ -71,14 +136,13 @@ class Effects:
             b = random.random()
 
             # Create firework using Bresenham lines
-            firework = self._create_single_firework(window, x, y, (r, g, b))
-            fireworks.append(firework)
+            self._create_single_firework(fireworks, x, y, (r, g, b))
 
+        fireworks.render()
         return fireworks
 
-    def _create_single_firework(self, window, x, y, color):
-        """Make one firework explosion using Bresenham algorithm"""
-        particles = []
+    def _create_single_firework(self, fireworks, x, y, color):
+        """Add one firework explosion's particle lines to fireworks"""
         num_particles = random.randint(8, 16)
 
         for i in range(num_particles):
@@ -88,38 +152,17 @@ class Effects:
             # Calculate end points
             end_x = x + length * math.cos(angle)
             end_y = y + length * math.sin(angle)
-
-            # Create line for explosion using Bresenham algorithm
-            line = BresenhamLine(Point(x, y), Point(end_x, end_y))
-            line.color = color_rgb(int(color[0]*255), int(color[1]*255), int(color[2]*255))
-            line.width = 2
-            line.draw(window)
-
-            particles.append(line)
-
-        return particles
+            fireworks.add_particle(x, y, end_x, end_y, color)
 
     def animate_fireworks(self, window, fireworks, duration=3):
         """Make fireworks change colors"""
-        start_time = time.time()
-
-        while time.time() - start_time < duration:
-            # Update fireworks
-            for particle_set in fireworks:
-                for particle in particle_set:
-                    # Random color change
-                    r = random.random()
-                    g = random.random()
-                    b = random.random()
-
-                    # Undraw and redraw with new color (since Bresenham lines need to be redrawn to change color)
-                    particle.undraw()
-                    particle.color = color_rgb(int(r*255), int(g*255), int(b*255))
-                    particle.draw(window)
-
-            # Small delay for animation
-            time.sleep(0.1)
-            window.update()
+        def recolor(step):
+            # Random color change for every particle, then one image update
+            fireworks.recolor(random)
+            fireworks.render()
+            self.mark_dirty()
+
+        return self.timeline.repeat(0.1, int(duration / 0.1), recolor)
 
     def coin_collect_effect(self, x, y, window):
         """Create sparkle effect when collecting a coin."""
@@ -139,30 +182,22 @@ class Effects:
             # Store particle with its angle
             particles.append((particle, angle))
 
-        # Animate particles
-        for _ in range(5):  # Loop 5 times for animation steps
-            # Update particles
+        def spread(distance):
+            # Move outward and grow slightly, all in place
             for particle, angle in particles:
-                # Move outward
-                dx = 3 * math.cos(angle)
-                dy = 3 * math.sin(angle)
-                particle.move(dx, dy)
-
-                # Increase size slightly
-                current_radius = particle.getRadius()
+                center = particle.getCenter()
+                particle.move(x + distance * math.cos(angle) - center.getX(),
+                              y + distance * math.sin(angle) - center.getY())
+                particle.setRadius(2 + distance / 6)
+            self.mark_dirty()
+
+        def clean_up():
+            for particle, _ in particles:
                 particle.undraw()
-                particle = MidpointCircle(particle.getCenter(), current_radius + 0.5)
-                particle.setFill("gold")
-                particle.setOutline("yellow")
-                particle.draw(window)
-
-            # Wait briefly
-            time.sleep(0.05)
-            window.update()
+            self.mark_dirty()
 
-        # Clean up
-        for particle, _ in particles:
-            particle.undraw()
+        # 15 pixels outward over a quarter second
+        return self.timeline.add([(0, 0), (0.25, 15)], spread, on_done=clean_up)
 
     def create_ui_decoration(self, window, text, position, color="gold"):
         """Make fancy text with sparkles"""
@@ -194,15 +229,12 @@ class Effects:
     def animate_text(self, text_obj, duration=3):
         """Make text change colors"""
         colors = ["gold", "orange", "yellow", "red", "purple", "blue"]
-        start_time = time.time()
 
-        while time.time() - start_time < duration:
+        def recolor(step):
             # Cycle through colors
-            color = colors[int(time.time() * 3) % len(colors)]
-            text_obj.setTextColor(color)
+            text_obj.setTextColor(colors[step % len(colors)])
 
-            # Small delay
-            time.sleep(0.1)
+        return self.timeline.repeat(1 / 3, int(duration * 3), recolor)
 
     def create_sparkle_effect(self, window, x, y):
         """Make a sparkle at a position using MidpointCircle algorithm"""
@@ -215,35 +247,24 @@ class Effects:
         center_circle.draw(window)
         sparkles.append(center_circle)
 
-        # Create rays using Bresenham lines
+        # Create rays using Bresenham lines, all in one batch
+        rays = []
         for i in range(8):
             angle = 2 * math.pi * i / 8
-            end_x = x + 10 * math.cos(angle)
-            end_y = y + 10 * math.sin(angle)
-
-            ray = BresenhamLine(Point(x, y), Point(end_x, end_y))
-            ray.color = "gold"
-            ray.draw(window)
-            sparkles.append(ray)
-
-        # Animate sparkle
-        for i in range(5):
-            # Pulse color
-            color = "gold" if i % 2 == 0 else "yellow"
-
-            # Update central circle
-            center_circle.undraw()
+            rays.append((x, y, x + 10 * math.cos(angle), y + 10 * math.sin(angle)))
+        ray_lines = BresenhamLines(rays)
+        ray_lines.color = "gold"
+        ray_lines.draw(window)
+        sparkles.append(ray_lines)
+
+        # Animate sparkle: pulse the color in place
+        def pulse(step):
+            color = "gold" if step % 2 == 0 else "yellow"
             center_circle.setFill(color)
-            center_circle.draw(window)
-
-            # Update rays
-            for j in range(1, len(sparkles)):
-                sparkles[j].undraw()
-                sparkles[j].color = color
-                sparkles[j].draw(window)
+            ray_lines.setFill(color)
+            self.mark_dirty()
 
-            time.sleep(0.1)
-            window.update()
+        self.timeline.repeat(0.1, 5, pulse)
 
         # Return all sparkle elements
-        return sparkles
\ No newline at end of file
+        return sparkles
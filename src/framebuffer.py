@@ -0,0 +1,257 @@
+"""Off-screen drawing backend: the raster algorithms write into a NumPy image.
+
+drawing_utils turns every rasterized pixel or span into a canvas item;
+Framebuffer writes the same pixels into an RGBA array instead, batched
+into a few NumPy assignments per shape. The result can be shown on a
+GraphWin as a single image per frame, or saved as a PNG, and nothing
+here needs a display until it is presented.
+"""
+import struct
+import sys
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from raster import bresenham_lines, circle_spans, midpoint_circle_points, polygon_spans
+
+# Colors the game uses by name; anything else is looked up through Tk when
+# graphics.py is loaded
+NAMED_COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "gray": (190, 190, 190),
+    "lightgray": (211, 211, 211), "red": (255, 0, 0), "green": (0, 255, 0),
+    "lightgreen": (144, 238, 144), "blue": (0, 0, 255), "lightblue": (173, 216, 230),
+    "darkblue": (0, 0, 139), "yellow": (255, 255, 0), "gold": (255, 215, 0),
+    "orange": (255, 165, 0), "salmon": (250, 128, 114), "pink": (255, 192, 203),
+    "purple": (160, 32, 240), "lightyellow": (255, 255, 224),
+}
+
+
+@lru_cache(maxsize=256)
+def parse_color(color):
+    """(r, g, b, a) for a Tk color name or a #rgb / #rrggbb string."""
+    key = color.lower().replace(" ", "")
+    if key in NAMED_COLORS:
+        return NAMED_COLORS[key] + (255,)
+    if key.startswith("#") and len(key) in (4, 7):
+        digits = key[1:] if len(key) == 7 else "".join(c * 2 for c in key[1:])
+        try:
+            return tuple(bytes.fromhex(digits)) + (255,)
+        except ValueError:
+            pass
+    graphics = sys.modules.get("graphics")
+    if graphics is not None:
+        try:
+            red, green, blue = graphics._root.winfo_rgb(color)
+            return (red >> 8, green >> 8, blue >> 8, 255)
+        except graphics.tk.TclError:
+            pass
+    raise ValueError(f"unknown color: {color!r}")
+
+
+@lru_cache(maxsize=128)
+def _circle_pixels(radius):
+    """Fill spans and outline points of a circle around (0, 0), as arrays."""
+    return circle_spans(radius), np.array(midpoint_circle_points(radius))
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+class Framebuffer:
+    """RGBA image, height x width x 4 uint8, that shapes are rasterized into."""
+
+    def __init__(self, width, height, background="white"):
+        """Create a framebuffer cleared to the background color."""
+        self.width = width
+        self.height = height
+        self.background = background
+        self.pixels = np.empty((height, width, 4), dtype=np.uint8)
+        self.clear()
+
+        # Tk image showing the pixels, once presented
+        self.window = None
+        self.image = None
+        self.item = None
+
+    def clear(self, color=None):
+        """Fill the whole framebuffer with color (the background by default)."""
+        self.pixels[:] = np.array(parse_color(color or self.background), dtype=np.uint8)
+
+    def fill_rect(self, x1, y1, x2, y2, color):
+        """Fill the pixels x1..x2, y1..y2 (inclusive) with one slice assignment."""
+        left, top = max(round(min(x1, x2)), 0), max(round(min(y1, y2)), 0)
+        right, bottom = round(max(x1, x2)) + 1, round(max(y1, y2)) + 1
+        self.pixels[top:bottom, left:right] = parse_color(color)
+
+    def plot(self, xs, ys, color, width=1):
+        """Set many pixels in one assignment; pixels off the image are dropped.
+
+        color is one color for every pixel, or an (N, 4) RGBA array with a
+        color per pixel. With width > 1 each pixel becomes a width x width
+        square, like the rectangles plot_runs draws.
+        """
+        xs = np.asarray(xs, dtype=np.intp).ravel()
+        ys = np.asarray(ys, dtype=np.intp).ravel()
+        colors = parse_color(color) if isinstance(color, str) else np.asarray(color, dtype=np.uint8)
+        if width > 1:
+            dx, dy = np.meshgrid(np.arange(width) - width // 2, np.arange(width) - width // 2)
+            xs = (xs[:, None] + dx.ravel()).ravel()
+            ys = (ys[:, None] + dy.ravel()).ravel()
+            if not isinstance(color, str):
+                colors = np.repeat(colors, width * width, axis=0)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self.pixels[ys[inside], xs[inside]] = colors if isinstance(color, str) else colors[inside]
+
+    def fill_spans(self, ys, lefts, rights, color):
+        """Fill the horizontal spans lefts[i]..rights[i] (inclusive) on rows ys[i].
+
+        All spans are filled together. With one span per row (circles,
+        rectangles) each row's mask is a single broadcast comparison;
+        otherwise each span adds +1 where it starts and -1 after it ends,
+        and a running sum along the rows marks every covered pixel.
+        """
+        ys = np.asarray(ys, dtype=np.intp).ravel()
+        lefts = np.maximum(np.asarray(lefts, dtype=np.intp).ravel(), 0)
+        rights = np.minimum(np.asarray(rights, dtype=np.intp).ravel(), self.width - 1)
+        keep = (ys >= 0) & (ys < self.height) & (lefts <= rights)
+        ys, lefts, rights = ys[keep], lefts[keep], rights[keep]
+        if ys.size == 0:
+            return
+
+        # Work only on the bounding box of the spans
+        top, bottom = ys.min(), ys.max() + 1
+        left, right = lefts.min(), rights.max() + 1
+        if ys.size == bottom - top and np.unique(ys).size == ys.size:
+            columns = np.arange(left, right)
+            covered = np.zeros((bottom - top, right - left), dtype=bool)
+            covered[ys - top] = (columns >= lefts[:, None]) & (columns <= rights[:, None])
+        else:
+            edges = np.zeros((bottom - top, right - left + 1), dtype=np.int32)
+            np.add.at(edges, (ys - top, lefts - left), 1)
+            np.add.at(edges, (ys - top, rights + 1 - left), -1)
+            covered = np.cumsum(edges, axis=1)[:, :-1] > 0
+        self.pixels[top:bottom, left:right][covered] = parse_color(color)
+
+    def line(self, x1, y1, x2, y2, color, width=1):
+        """Draw a Bresenham line, the pixels draw_bresenham_line draws."""
+        xs, ys, _ = bresenham_lines([x1], [y1], [x2], [y2])
+        self.plot(xs, ys, color, width)
+
+    def lines(self, endpoints, colors, width=1):
+        """Draw many Bresenham lines with one kernel call and one write.
+
+        endpoints is an (N, 4) array of x1, y1, x2, y2; colors is one color
+        or an (N, 4) RGBA array with a color per line.
+        """
+        endpoints = np.asarray(endpoints, dtype=np.float64).reshape(-1, 4)
+        xs, ys, index = bresenham_lines(*endpoints.T)
+        if not isinstance(colors, str):
+            colors = np.asarray(colors, dtype=np.uint8)[index]
+        self.plot(xs, ys, colors, width)
+
+    def circle(self, center_x, center_y, radius, fill_color, outline_color=None, width=1):
+        """Draw a filled midpoint circle, like draw_midpoint_circle."""
+        if outline_color is None:
+            outline_color = fill_color
+        center_x, center_y = round(center_x), round(center_y)
+
+        # Scanline fill out to the outline, then the outline itself
+        spans, points = _circle_pixels(max(1, int(radius)))
+        self.fill_spans(center_y + spans[:, 0], center_x + spans[:, 1],
+                        center_x + spans[:, 2], fill_color)
+        if outline_color != fill_color or width > 1:
+            self.plot(center_x + points[:, 0], center_y + points[:, 1], outline_color, width)
+
+    def polygon(self, vertices, fill_color, outline_color=None, width=1):
+        """Fill a polygon of (x, y) vertices with the scanline fill, with an optional outline."""
+        self.fill_spans(*polygon_spans(vertices), fill_color)
+        if outline_color:
+            points = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+            self.lines(np.hstack((points, np.roll(points, -1, axis=0))), outline_color, width)
+
+    def rectangle(self, x1, y1, x2, y2, fill_color=None, outline_color="black", width=1):
+        """Draw a rectangle with a Bresenham border, like BresenhamRectangle."""
+        x1, y1, x2, y2 = round(x1), round(y1), round(x2), round(y2)
+        if fill_color:
+            ys = np.arange(min(y1, y2), max(y1, y2) + 1)
+            self.fill_spans(ys, np.full(ys.size, min(x1, x2)), np.full(ys.size, max(x1, x2)),
+                            fill_color)
+        if outline_color:
+            for start, end in (((x1, y1), (x2, y1)), ((x2, y1), (x2, y2)),
+                               ((x2, y2), (x1, y2)), ((x1, y2), (x1, y1))):
+                self.line(*start, *end, outline_color, width)
+
+    def to_ppm(self):
+        """The pixels as binary PPM (alpha dropped), which Tk loads quickly."""
+        header = b"P6 %d %d 255\n" % (self.width, self.height)
+        return header + np.ascontiguousarray(self.pixels[:, :, :3]).tobytes()
+
+    def to_png(self, path=None):
+        """Encode the pixels as an RGBA PNG; also write it to path if given."""
+        rows = np.zeros((self.height, 1 + self.width * 4), dtype=np.uint8)
+        rows[:, 1:] = self.pixels.reshape(self.height, -1)  # Filter byte 0 per row
+        data = b"".join((
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 6, 0, 0, 0)),
+            _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)),
+            _png_chunk(b"IEND", b""),
+        ))
+        if path is not None:
+            with open(path, "wb") as f:
+                f.write(data)
+        return data
+
+    def present(self, window, x=0, y=0, below=False):
+        """Show the pixels on a GraphWin, top-left at (x, y).
+
+        The first call creates one canvas image item (under the window's
+        other items if below is set); later calls only replace its pixels,
+        so each frame costs a single image update.
+        """
+        from graphics import tk, update
+
+        if self.window is not window:
+            master = window if isinstance(window, tk.Misc) else None
+            self.image = tk.PhotoImage(master=master, width=self.width, height=self.height)
+            self.item = window.create_image(x, y, image=self.image, anchor="nw")
+            if below:
+                window.tag_lower(self.item)
+            self.window = window
+        self.image.configure(data=self.to_ppm(), format="PPM")
+        if window.autoflush:
+            update()
+
+    def present_region(self, x1, y1, x2, y2):
+        """Push only the pixels x1..x2, y1..y2 (inclusive) to the presented image.
+
+        For small changes this is far cheaper than present(), which
+        re-encodes the whole image: a one-color block is a single put, and
+        anything else is sent as rows of colors. Does nothing until the
+        framebuffer has been presented.
+        """
+        if self.image is None:
+            return
+        from graphics import update
+
+        left, top = max(x1, 0), max(y1, 0)
+        right, bottom = min(x2, self.width - 1) + 1, min(y2, self.height - 1) + 1
+        block = self.pixels[top:bottom, left:right, :3]
+        if block.size == 0:
+            return
+        if (block == block[0, 0]).all():
+            self.image.put("#%02x%02x%02x" % tuple(block[0, 0].tolist()), to=(left, top, right, bottom))
+        else:
+            rows = ("{%s}" % " ".join("#%02x%02x%02x" % tuple(pixel) for pixel in row)
+                    for row in block.tolist())
+            self.image.put(" ".join(rows), to=(left, top))
+        if self.window.autoflush:
+            update()
+
+    def hide(self):
+        """Remove the presented image from its window."""
+        if self.window is not None:
+            if not self.window.isClosed():
+                self.window.delete(self.item)
+            self.window = self.image = self.item = None
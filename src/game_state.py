@@ -0,0 +1,340 @@
+"""Pure game logic with no window, so games can run headless.
+
+GameState holds the player, coins and score for a maze grid and tells a
+renderer what changed. The GUI (Maze and Player) is one renderer; the
+NullRenderer draws nothing, which is what simulations and servers use.
+"""
+import random
+import time
+import numpy as np
+from config import GameConfig, CellType
+from generators import get_generator
+from solver import DistanceField, collect_all_length, detour_costs, validate_maze
+from maze_id import SEED_MASK, MazeSpec, decode_maze_id, derived_cache, new_seed
+from utils.grid_utils import MazeGrid
+
+# Movement keys and the (dx, dy) step they take
+KEY_DIRECTIONS = {
+    "Up": (0, -1), "w": (0, -1),
+    "Down": (0, 1), "s": (0, 1),
+    "Left": (-1, 0), "a": (-1, 0),
+    "Right": (1, 0), "d": (1, 0),
+}
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+# Generated mazes that fail validation are regenerated this many times
+GENERATION_ATTEMPTS = 10
+
+# Plain ints for the per-move checks (Enum attribute lookups are slow)
+WALL = CellType.WALL.value
+PATH = CellType.PATH.value
+END = CellType.END.value
+COIN = CellType.COIN.value
+
+
+def maze_size(width=None, height=None, cell_size=None):
+    """(rows, cols) of the maze: GameConfig.MAZE_ROWS/MAZE_COLS, or what fills a window of the given size."""
+    width = width or GameConfig.WINDOW_WIDTH
+    height = height or GameConfig.WINDOW_HEIGHT
+    cell_size = cell_size or GameConfig.CELL_SIZE
+    return (GameConfig.MAZE_ROWS or (height - 50) // cell_size,
+            GameConfig.MAZE_COLS or width // cell_size)
+
+
+def place_marker(grid, row_range, col_range, cell_type, fallback, rng=random):
+    """Put cell_type on a random path cell inside the given region"""
+    region = grid.cells[row_range, col_range]
+    ys, xs = (region == PATH).nonzero()
+    if len(xs):
+        i = rng.randrange(len(xs))
+        x, y = int(xs[i]) + col_range.start, int(ys[i]) + row_range.start
+    else:
+        x, y = fallback
+    grid.set(x, y, cell_type.value)
+    return x, y
+
+
+def add_coins(grid, coin_count, rng=random, target_detour=None, detour=None):
+    """Put up to coin_count coins on random reachable empty cells; returns their positions.
+
+    With target_detour, coins go on the cells whose detour cost (the extra
+    steps fetching the coin adds to a START -> END run) is closest to it.
+    detour is the grid's detour_costs, computed here if not given.
+    """
+    if detour is None:
+        detour = detour_costs(grid)
+    if detour is None:
+        return []
+    ys, xs = np.nonzero((grid.cells == PATH) & (detour >= 0))
+
+    if target_detour is not None and len(xs) > coin_count:
+        # Keep the three candidates per coin closest to the target, pick among them
+        pool = np.argsort(np.abs(detour[ys, xs] - target_detour), kind="stable")
+        pool = np.sort(pool[:coin_count * 3])
+        xs, ys = xs[pool], ys[pool]
+
+    coins = []
+    for i in rng.sample(range(len(xs)), min(coin_count, len(xs))):
+        x, y = int(xs[i]), int(ys[i])
+        grid.set(x, y, COIN)
+        coins.append((x, y))
+    return coins
+
+
+def build_maze(rows, cols, algorithm="backtracker", complexity=0.7, coin_count=None, rng=None,
+               coin_detour=None, validate=True):
+    """Generate a maze with start, end and coins.
+
+    All randomness comes from rng, so a random.Random(seed) reproduces the
+    maze exactly; None uses a fresh unseeded one. coin_detour is the target
+    detour cost for coins (see add_coins); None scatters them over all
+    reachable cells.
+
+    Every maze is checked with the solver (END and all coins reachable from
+    START) and regenerated if it fails; ValueError is raised if no attempt
+    passes (for instance when the grid is too small for START and END).
+    validate=False skips the solver entirely, for simulations: the first
+    maze is kept and coins go on any path cell, ignoring coin_detour. Our
+    generators carve perfect mazes, so this only matters for tiny grids.
+    Returns (grid, coins) where coins lists the coin positions.
+    """
+    coin_count = GameConfig.COIN_COUNT if coin_count is None else coin_count
+    rng = rng or random.Random()
+    generate = get_generator(algorithm)
+
+    for _ in range(GENERATION_ATTEMPTS):
+        # Carve passages with the selected generator
+        grid = MazeGrid.from_buffer(generate(rows, cols, complexity, rng), rows, cols)
+
+        # Place start near top left
+        start = place_marker(grid, slice(0, min(5, rows//2)), slice(0, min(5, cols//2)),
+                             CellType.START, (1, 1), rng)
+
+        # Place end near bottom right
+        end = place_marker(grid, slice(max(rows-5, rows//2), rows), slice(max(cols-5, cols//2), cols),
+                           CellType.END, (cols-2, rows-2), rng)
+
+        if not validate:
+            # Every path cell counts as reachable at no detour cost
+            detour = np.zeros(grid.cells.shape, np.int32)
+            return grid, add_coins(grid, coin_count, rng, None, detour)
+
+        # One search from START serves both coin placement and validation
+        detour = detour_costs(grid, start, end)
+        coins = add_coins(grid, coin_count, rng, coin_detour, detour)
+        problems = validate_maze(grid, None if detour is None else detour >= 0)
+        if not problems:
+            return grid, coins
+    raise ValueError(f"could not generate a valid {rows}x{cols} maze: {problems[0]}")
+
+
+def maze_spec(seed=None, difficulty=None, algorithm=None, rows=None, cols=None, coin_count=None):
+    """MazeSpec for the current settings, with a new seed unless one is given.
+
+    Seeds are 32-bit (what a maze ID holds); bigger or negative seeds are
+    reduced to their low 32 bits, so the maze and its ID use the same seed.
+    """
+    difficulty = difficulty or GameConfig.DIFFICULTY
+    settings = GameConfig.DIFFICULTY_SETTINGS[difficulty]
+    if rows is None or cols is None:
+        rows, cols = maze_size()
+    return MazeSpec(
+        new_seed() if seed is None else seed & SEED_MASK,
+        difficulty,
+        algorithm or GameConfig.MAZE_ALGORITHM or settings.get("maze_algorithm", "backtracker"),
+        rows,
+        cols,
+        GameConfig.COIN_COUNT if coin_count is None else coin_count,
+    )
+
+
+def build_from_spec(spec):
+    """Build the maze a MazeSpec (or maze ID string) describes. Returns (grid, coins)."""
+    if isinstance(spec, str):
+        spec = decode_maze_id(spec)
+    settings = GameConfig.DIFFICULTY_SETTINGS[spec.difficulty]
+    return build_maze(spec.rows, spec.cols, spec.algorithm, settings["maze_complexity"],
+                      spec.coin_count, random.Random(spec.seed), settings.get("coin_detour"))
+
+
+class NullRenderer:
+    """Renderer that draws nothing, for headless games."""
+
+    def player_moved(self, x, y):
+        """Called after the player moves to (x, y)."""
+        return False
+
+    def coin_collected(self, x, y):
+        """Called after the coin on (x, y) is collected."""
+
+
+class GameState:
+    """Player position, coins and score on a maze grid.
+
+    The grid can be a MazeGrid or a ChunkedMaze. coins is the set of known
+    coin positions still to collect; how they are drawn is the renderer's
+    business. Collection is decided by the grid, so endless mazes need not
+    list their coins at all.
+    """
+
+    def __init__(self, grid, coins=(), renderer=None, maze_id=None):
+        self.grid = grid
+        self.maze_id = maze_id  # Set when the maze can be rebuilt from an ID
+        self.renderer = renderer or NullRenderer()
+        self.x, self.y = grid.find_start() or (1, 1)
+        self.initial_coins = tuple(coins)
+        self.coins = set(self.initial_coins)
+        self.coins_collected = 0
+        self.score = 0
+        self.moves = 0
+        self.won = False
+        self._distance_field = None
+        self._par = None
+
+    @property
+    def position(self):
+        return (self.x, self.y)
+
+    def can_move(self, dx, dy):
+        """Check if the cell one step in (dx, dy) is open"""
+        x, y = self.x + dx, self.y + dy
+        return self.grid.in_bounds(x, y) and self.grid.get(x, y) != WALL
+
+    def move(self, dx, dy):
+        """Move the player if the target cell is open. Returns True on a win."""
+        x, y = self.x + dx, self.y + dy
+        grid = self.grid
+        if self.won or not grid.in_bounds(x, y):
+            return False
+        cell = grid.get(x, y)
+        if cell == WALL:
+            return False
+
+        self.x, self.y = x, y
+        self.moves += 1
+        grid.focus(x, y)
+        self.renderer.player_moved(x, y)
+
+        if cell == COIN:
+            self.collect_coin(x, y)
+        self.won = cell == END
+        return self.won
+
+    def handle_key(self, key):
+        """Move for a movement key; other keys are ignored"""
+        direction = KEY_DIRECTIONS.get(key)
+        if direction:
+            return self.move(*direction)
+        return False
+
+    def collect_coin(self, x, y):
+        """Collect the coin on (x, y), if there is one"""
+        if self.grid.get(x, y) != COIN:
+            return False
+        self.grid.set(x, y, PATH)
+        self.coins.discard((x, y))
+        self.coins_collected += 1
+        self.score += GameConfig.POINTS_PER_COIN
+        self.renderer.coin_collected(x, y)
+        return True
+
+    def is_game_won(self, x, y):
+        """Check if (x, y) is the exit"""
+        return self.grid.get(x, y) == END
+
+    def distance_field(self):
+        """Distances to END, computed on first use; None without an END"""
+        if self._distance_field is None:
+            end = self.grid.find_end()
+            if end is None:
+                return None
+            self._distance_field = self._derived(
+                "distance_to_end", lambda: DistanceField(self.grid, end))
+        return self._distance_field
+
+    def distance_to_end(self):
+        """Steps left on the shortest path to END, or None"""
+        field = self.distance_field()
+        return field.distance(self.x, self.y) if field else None
+
+    def hint(self):
+        """The (dx, dy) of the next step towards END, or None"""
+        field = self.distance_field()
+        return field.next_step(self.x, self.y) if field else None
+
+    def par_moves(self):
+        """Fewest moves that collect every coin and reach END, or None"""
+        if self._par is None and self.grid.find_end() is not None:
+            self._par = self._derived(
+                "par_moves", lambda: collect_all_length(self.grid, self.initial_coins))
+        return self._par
+
+    def _derived(self, name, build):
+        """Compute data derived from the maze, shared by ID when there is one"""
+        if self.maze_id is None:
+            return build()
+        return derived_cache.get(self.maze_id, name, build)
+
+    def coins_remaining(self):
+        """Coins still on the maze (only those tracked, for endless mazes)"""
+        return len(self.coins)
+
+
+def new_game(rows=None, cols=None, algorithm="backtracker", complexity=0.7,
+             coin_count=None, rng=None, renderer=None, coin_detour=None, validate=True):
+    """Generate a maze and return a fresh GameState on it (see build_maze)."""
+    if rows is None or cols is None:
+        rows, cols = maze_size()
+    grid, coins = build_maze(rows, cols, algorithm, complexity, coin_count, rng, coin_detour,
+                             validate)
+    return GameState(grid, coins, renderer)
+
+
+def game_from_id(maze_id, renderer=None):
+    """A fresh GameState on the maze a maze ID describes."""
+    grid, coins = build_from_spec(decode_maze_id(maze_id))
+    return GameState(grid, coins, renderer, maze_id)
+
+
+def random_playout(state, max_moves=1000, rng=random):
+    """Make random open moves until the game is won or max_moves are tried.
+
+    Returns True if the game was won.
+    """
+    # Drawing all the moves up front is much cheaper than one choice() per move
+    move = state.move
+    for dx, dy in rng.choices(DIRECTIONS, k=max_moves):
+        if move(dx, dy):
+            return True
+    return state.won
+
+
+def simulate_games(count, max_moves=1000, seed=None, validate=False, **maze_options):
+    """Play count random headless games.
+
+    Returns a summary dict with the number of wins, total moves and coins,
+    and the games per second achieved. maze_options go to new_game; the
+    mazes skip the solver checks unless validate is True.
+    """
+    rng = random.Random(seed)
+    wins = moves = coins = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        state = new_game(rng=rng, validate=validate, **maze_options)
+        wins += random_playout(state, max_moves, rng)
+        moves += state.moves
+        coins += state.coins_collected
+    elapsed = time.perf_counter() - start
+    return {
+        "games": count,
+        "wins": wins,
+        "moves": moves,
+        "coins": coins,
+        "seconds": elapsed,
+        "games_per_second": count / elapsed if elapsed else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    print(simulate_games(1000))
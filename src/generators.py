@@ -0,0 +1,382 @@
+"""Maze generation algorithms.
+
+Generators work on a flat ``bytearray`` (one byte per cell, row-major) so
+they stay fast and compact on very large grids, and they never import the
+graphics library.
+"""
+import random
+from array import array
+from functools import lru_cache
+from itertools import permutations
+from config import CellType
+
+# Carving steps between maze cells: right, down, left, up
+DIRECTIONS = [(2, 0), (0, 2), (-2, 0), (0, -2)]
+
+# Every possible ordering of the directions, so picking a shuffled order
+# costs a single random number instead of a full shuffle
+DIRECTION_ORDERS = list(permutations(DIRECTIONS))
+
+# Padding around the working grid; moves jump two cells so two cells of
+# border let us skip bounds checks entirely
+_PAD = 2
+
+# While carving, walls are 0 and every other cell is nonzero: the border
+# and carved passages are _OPEN, and each carved maze cell holds a code
+# (1 + 4 * its direction order + the direction it was entered by) so the
+# walk can back up without a stack
+_OPEN = 255
+_CARVED_TO_CELLS = bytes([CellType.WALL.value]) + bytes([CellType.PATH.value]) * 255
+
+
+@lru_cache(maxsize=32)
+def _carve_tables(width):
+    """Flat offsets of every direction order, and lookups by cell code, for a grid width.
+
+    Returns (order offsets, step -> entry code, code -> order offsets,
+    code -> offset back to the parent cell).
+    """
+    steps = [dy * width + dx for dx, dy in DIRECTIONS]
+    order_offsets = [tuple(dy * width + dx for dx, dy in order) for order in DIRECTION_ORDERS]
+    entry_code = {step: 1 + direction for direction, step in enumerate(steps)}
+    codes = range(4 * len(order_offsets))
+    order_of = [None] + [order_offsets[code // 4] for code in codes]
+    parent_of = [None] + [-steps[code % 4] for code in codes]
+    return order_offsets, entry_code, order_of, parent_of
+
+
+def carve_backtracker(rows, cols, complexity, rng=random):
+    """Carve a maze with an iterative recursive backtracker.
+
+    Visits cells in the same depth-first order as a recursive carve, but
+    each carved cell remembers its direction order and the way back to
+    its parent, so backing up needs no stack and memory stays at one byte
+    per cell. Returns a flat bytearray of ``rows * cols`` cells (1 = wall,
+    0 = path).
+    """
+    width = cols + 2 * _PAD
+
+    # Working grid of walls surrounded by a border that is never carved
+    border = bytes([_OPEN]) * (_PAD * width + _PAD)
+    row_gap = bytes([_OPEN]) * (2 * _PAD)
+    cells = bytearray(border + (bytes(cols) + row_gap) * (rows - 1) + bytes(cols) + border)
+
+    order_offsets, entry_code, order_of, parent_of = _carve_tables(width)
+    order_count = len(order_offsets)
+    random_value = rng.random
+
+    # Start from a random point
+    start_x = rng.randrange(1, cols - 1, 2)
+    start_y = rng.randrange(1, rows - 1, 2)
+    root = index = (start_y + _PAD) * width + start_x + _PAD
+    choice = int(random_value() * order_count)
+    cells[index] = 1 + 4 * choice
+    order = order_offsets[choice]
+
+    while True:
+        # Carved neighbours are never walls again, so rescanning the order
+        # from the start tries the remaining directions in turn
+        first, second, third, fourth = order
+        if not cells[index + first]:
+            step = first
+        elif not cells[index + second]:
+            step = second
+        elif not cells[index + third]:
+            step = third
+        elif not cells[index + fourth]:
+            step = fourth
+        else:
+            # Dead end: back up to the parent and carry on with its order
+            if index == root:
+                break
+            index += parent_of[cells[index]]
+            order = order_of[cells[index]]
+            continue
+
+        cells[index + (step >> 1)] = _OPEN
+        index += step
+
+        # Pick a shuffled order; with probability `complexity` shuffle
+        # again, reusing the leftover fraction of the same draw.
+        # float.__trunc__ is int() without the constructor call.
+        draw = random_value() * order_count
+        choice = draw.__trunc__()
+        draw -= choice
+        if draw < complexity:
+            choice = (draw / complexity * order_count).__trunc__()
+        cells[index] = entry_code[step] + 4 * choice
+        order = order_offsets[choice]
+
+    # Strip the border and turn the codes back into cell values
+    rows_start = _PAD * width + _PAD
+    rows_end = (rows + _PAD) * width
+    maze = bytearray().join([cells[start:start + cols] for start in range(rows_start, rows_end, width)])
+    return maze.translate(_CARVED_TO_CELLS)
+
+
+# Registry of generators by name; each takes (rows, cols, complexity, rng)
+# and returns a flat bytearray of CellType values
+GENERATORS = {}
+
+
+def register_generator(name):
+    """Register a maze generator under the given name."""
+    def decorator(func):
+        GENERATORS[name] = func
+        return func
+    return decorator
+
+
+def get_generator(name):
+    """Look up a registered generator, raising ValueError for unknown names."""
+    try:
+        return GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown maze algorithm: {name!r} "
+                         f"(available: {', '.join(sorted(GENERATORS))})")
+
+
+register_generator("backtracker")(carve_backtracker)
+
+
+# The remaining generators work on a lattice of maze cells that sit on odd
+# grid coordinates, the same cells the backtracker carves between.
+# Lattice cell c = j * cell_cols + i lives at grid position (2i + 1, 2j + 1).
+
+def _grid_index(cell, cell_cols, cols):
+    """Flat grid index of a lattice cell."""
+    j, i = divmod(cell, cell_cols)
+    return (2 * j + 1) * cols + 2 * i + 1
+
+
+def _neighbours(cell, cell_rows, cell_cols):
+    """Lattice cells next to the given cell."""
+    j, i = divmod(cell, cell_cols)
+    result = []
+    if i > 0:
+        result.append(cell - 1)
+    if i < cell_cols - 1:
+        result.append(cell + 1)
+    if j > 0:
+        result.append(cell - cell_cols)
+    if j < cell_rows - 1:
+        result.append(cell + cell_cols)
+    return result
+
+
+def _carve_between(maze, first, second, cell_cols, cols):
+    """Open both lattice cells and the wall between them."""
+    a = _grid_index(first, cell_cols, cols)
+    b = _grid_index(second, cell_cols, cols)
+    path = CellType.PATH.value
+    maze[a] = path
+    maze[b] = path
+    maze[(a + b) // 2] = path
+
+
+def _solid(rows, cols):
+    """A grid that is all walls."""
+    return bytearray([CellType.WALL.value]) * (rows * cols)
+
+
+@register_generator("binary_tree")
+def binary_tree(rows, cols, complexity, rng=random):
+    """Binary tree maze: every cell links north or west."""
+    maze = _solid(rows, cols)
+    cell_rows, cell_cols = rows // 2, cols // 2
+    for cell in range(cell_rows * cell_cols):
+        j, i = divmod(cell, cell_cols)
+        choices = []
+        if j > 0:
+            choices.append(cell - cell_cols)
+        if i > 0:
+            choices.append(cell - 1)
+        if choices:
+            _carve_between(maze, cell, rng.choice(choices), cell_cols, cols)
+        else:
+            maze[_grid_index(cell, cell_cols, cols)] = CellType.PATH.value
+    return maze
+
+
+@register_generator("prim")
+def prim(rows, cols, complexity, rng=random):
+    """Randomized Prim's algorithm: grow the maze from a random frontier."""
+    maze = _solid(rows, cols)
+    cell_rows, cell_cols = rows // 2, cols // 2
+    total = cell_rows * cell_cols
+    if total == 0:
+        return maze
+
+    in_maze = bytearray(total)
+    on_frontier = bytearray(total)
+    frontier = []
+
+    def add(cell):
+        in_maze[cell] = 1
+        maze[_grid_index(cell, cell_cols, cols)] = CellType.PATH.value
+        for neighbour in _neighbours(cell, cell_rows, cell_cols):
+            if not in_maze[neighbour] and not on_frontier[neighbour]:
+                on_frontier[neighbour] = 1
+                frontier.append(neighbour)
+
+    add(rng.randrange(total))
+    while frontier:
+        # Swap-remove a random frontier cell
+        k = rng.randrange(len(frontier))
+        frontier[k], frontier[-1] = frontier[-1], frontier[k]
+        cell = frontier.pop()
+        linked = [n for n in _neighbours(cell, cell_rows, cell_cols) if in_maze[n]]
+        _carve_between(maze, cell, rng.choice(linked), cell_cols, cols)
+        add(cell)
+    return maze
+
+
+@register_generator("kruskal")
+def kruskal(rows, cols, complexity, rng=random):
+    """Randomized Kruskal's algorithm over shuffled lattice edges."""
+    maze = _solid(rows, cols)
+    cell_rows, cell_cols = rows // 2, cols // 2
+    total = cell_rows * cell_cols
+    parent = array("q", range(total))
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    edges = []
+    for cell in range(total):
+        j, i = divmod(cell, cell_cols)
+        if i < cell_cols - 1:
+            edges.append((cell, cell + 1))
+        if j < cell_rows - 1:
+            edges.append((cell, cell + cell_cols))
+    rng.shuffle(edges)
+
+    for first, second in edges:
+        root_a, root_b = find(first), find(second)
+        if root_a != root_b:
+            parent[root_b] = root_a
+            _carve_between(maze, first, second, cell_cols, cols)
+    if total == 1:
+        maze[_grid_index(0, cell_cols, cols)] = CellType.PATH.value
+    return maze
+
+
+@register_generator("wilson")
+def wilson(rows, cols, complexity, rng=random):
+    """Wilson's algorithm: loop-erased random walks give an unbiased maze."""
+    maze = _solid(rows, cols)
+    cell_rows, cell_cols = rows // 2, cols // 2
+    total = cell_rows * cell_cols
+    if total == 0:
+        return maze
+
+    in_maze = bytearray(total)
+    # Last step taken out of each cell during the current walk
+    next_cell = array("q", [0]) * total
+
+    first = rng.randrange(total)
+    in_maze[first] = 1
+    maze[_grid_index(first, cell_cols, cols)] = CellType.PATH.value
+
+    order = list(range(total))
+    rng.shuffle(order)
+    for start in order:
+        if in_maze[start]:
+            continue
+
+        # Random walk until the maze is hit; overwriting next_cell erases loops
+        cell = start
+        while not in_maze[cell]:
+            step = rng.choice(_neighbours(cell, cell_rows, cell_cols))
+            next_cell[cell] = step
+            cell = step
+
+        # Carve the loop-erased path into the maze
+        cell = start
+        while not in_maze[cell]:
+            in_maze[cell] = 1
+            _carve_between(maze, cell, next_cell[cell], cell_cols, cols)
+            cell = next_cell[cell]
+    return maze
+
+
+def iter_ellers_rows(rows, cols, rng=random, join_chance=0.5):
+    """Eller's algorithm, yielding one grid row at a time.
+
+    Only the current row's set labels are kept, so memory is O(cols) no
+    matter how tall the maze is. Yields ``rows`` bytes objects of length
+    ``cols``.
+    """
+    wall = CellType.WALL.value
+    path = CellType.PATH.value
+    cell_rows, cell_cols = rows // 2, cols // 2
+    wall_row = bytes([wall]) * cols
+
+    yield wall_row
+    emitted = 1
+
+    # Set label of each cell in the current row, plus members of each set
+    labels = list(range(cell_cols))
+    members = {label: [label] for label in labels}
+    next_label = cell_cols
+
+    for j in range(cell_rows):
+        last = j == cell_rows - 1
+        row = bytearray(wall_row)
+        for i in range(cell_cols):
+            row[2 * i + 1] = path
+
+        # Randomly join neighbours from different sets (all of them on the last row)
+        for i in range(cell_cols - 1):
+            left, right = labels[i], labels[i + 1]
+            if left != right and (last or rng.random() < join_chance):
+                row[2 * i + 2] = path
+                # Relabel the smaller set
+                if len(members[left]) < len(members[right]):
+                    left, right = right, left
+                for k in members[right]:
+                    labels[k] = left
+                members[left].extend(members.pop(right))
+
+        yield bytes(row)
+        emitted += 1
+        if last:
+            break
+
+        # Every set continues down at least once
+        below = bytearray(wall_row)
+        new_labels = [None] * cell_cols
+        for label, cells in members.items():
+            down = [k for k in cells if rng.random() < join_chance]
+            if not down:
+                down = [rng.choice(cells)]
+            for k in down:
+                below[2 * k + 1] = path
+                new_labels[k] = label
+
+        # Cells that did not continue start new sets
+        for k in range(cell_cols):
+            if new_labels[k] is None:
+                new_labels[k] = next_label
+                next_label += 1
+        labels = new_labels
+        members = {}
+        for k, label in enumerate(labels):
+            members.setdefault(label, []).append(k)
+
+        yield bytes(below)
+        emitted += 1
+
+    # Pad with wall rows for odd heights
+    while emitted < rows:
+        yield wall_row
+        emitted += 1
+
+
+@register_generator("ellers")
+def ellers(rows, cols, complexity, rng=random):
+    """Eller's algorithm assembled into a full grid."""
+    return bytearray(b"".join(iter_ellers_rows(rows, cols, rng)))
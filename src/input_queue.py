@@ -0,0 +1,104 @@
+from graphics import GraphicsError, Point, tk
+from collections import deque, namedtuple
+
+# kind is "key" or "click"; key is the Tk keysym, point the click position
+InputEvent = namedtuple("InputEvent", ["kind", "key", "point"])
+
+
+class InputQueue:
+    """Queues a window's key presses and mouse clicks as they happen.
+
+    Events are delivered by Tk bindings, and waiting for one blocks inside
+    the Tk event loop, so nothing busy-polls and an idle screen uses no CPU.
+    """
+
+    def __init__(self, window):
+        """Start collecting events from window."""
+        self.window = window
+        self.events = deque()
+        self.closed = False
+        self._wake = tk.IntVar(master=window, value=0)
+
+        # Added next to the window's own bindings, which keep working
+        window.master.bind("<KeyPress>", self._on_key, add="+")
+        window.bind("<Button-1>", self._on_click, add="+")
+        window.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _notify(self):
+        """Wake up anyone blocked in wait()"""
+        self._wake.set(self._wake.get() + 1)
+
+    def _on_key(self, event):
+        if self.closed:
+            return
+        self.events.append(InputEvent("key", event.keysym, None))
+        self._notify()
+
+    def _on_click(self, event):
+        if self.closed:
+            return
+        x, y = self.window.toWorld(event.x, event.y)
+        self.events.append(InputEvent("click", None, Point(x, y)))
+        self._notify()
+
+    def _on_destroy(self, event):
+        self._notify()
+
+    def wait(self, timeout=None):
+        """Block until an event is queued or timeout seconds pass.
+
+        Returns True if events are waiting.
+        """
+        if self.events or self.window.isClosed():
+            return bool(self.events)
+
+        after_id = None
+        if timeout is not None:
+            after_id = self.window.after(max(1, int(timeout * 1000)), self._notify)
+        self.window.wait_variable(self._wake)
+        if after_id is not None and not self.window.isClosed():
+            self.window.after_cancel(after_id)
+        return bool(self.events)
+
+    def next_event(self, timeout=None):
+        """Return the next event, waiting up to timeout seconds (forever if None)."""
+        while not self.events:
+            if self.window.isClosed():
+                raise GraphicsError("waiting for input in closed window")
+            if not self.wait(timeout) and timeout is not None:
+                return None
+        return self.events.popleft()
+
+    def drain(self):
+        """Remove and return all queued events."""
+        events = list(self.events)
+        self.events.clear()
+        return events
+
+    def dispatch(self, handlers):
+        """Pass each queued event to handlers[event.kind]; stop at the first truthy result.
+
+        Returns that result, or None once the queue is empty.
+        """
+        while self.events:
+            event = self.events.popleft()
+            handler = handlers.get(event.kind)
+            if handler:
+                result = handler(event)
+                if result:
+                    return result
+        return None
+
+    def wait_click(self):
+        """Wait for a mouse click and return its Point (like GraphWin.getMouse)."""
+        while True:
+            event = self.next_event()
+            if event.kind == "click":
+                return event.point
+
+    def close(self):
+        """Stop collecting events."""
+        # Bindings stay in place (unbinding by id would also drop the
+        # window's own handlers) but ignore everything from now on
+        self.closed = True
+        self.events.clear()
@@ -1,10 +1,15 @@
 from graphics import *
-from maze import Maze
+from maze import Maze, InfiniteMaze
+from maze_pool import MazePool
 from player import Player
 from config import GameConfig
 from drawing_utils import BresenhamRectangle
+from scheduler import FrameScheduler
+from input_queue import InputQueue
+from effects import Effects
+from timeline import Timeline
+from game_state import maze_spec
 import time
-import random
 
 
 
@@ -129,8 +134,9 @@ def welcome_screen():
     exit_btn.draw()
 
     # Wait for click
+    clicks = InputQueue(win)
     while True:
-        pt = win.getMouse()
+        pt = clicks.wait_click()
 
         if start_btn.clicked(pt):
             win.close()
@@ -187,6 +193,13 @@ def settings_screen():
         color_btn.draw()
         color_buttons.append((color_btn, color))
 
+    # Classic or infinite maze mode
+    mode_btn = Button(win, Point(GameConfig.WINDOW_WIDTH / 2, 350), 180, 30,
+                      "Mode: Infinite" if GameConfig.INFINITE_MODE else "Mode: Classic",
+                      use_bresenham=True)
+    mode_btn.rect.setFill("lightyellow")
+    mode_btn.draw()
+
     # Back button with Bresenham rectangle border
     back_btn = Button(win, Point(GameConfig.WINDOW_WIDTH / 2, 400), 150, 50, "Back", use_bresenham=True)
     back_btn.draw()
@@ -206,8 +219,9 @@ def settings_screen():
             break
 
     # Wait for clicks
+    clicks = InputQueue(win)
     while True:
-        pt = win.getMouse()
+        pt = clicks.wait_click()
 
         if easy_btn.clicked(pt):
             easy_btn.setSelected()
@@ -242,12 +256,16 @@ def settings_screen():
                     b.setSelected(False)
                 btn.setSelected()
 
+        if mode_btn.clicked(pt):
+            GameConfig.INFINITE_MODE = not GameConfig.INFINITE_MODE
+            mode_btn.label.setText("Mode: Infinite" if GameConfig.INFINITE_MODE else "Mode: Classic")
+
         if back_btn.clicked(pt):
             win.close()
             return
 
 
-def win_screen(score, elapsed_time):
+def win_screen(score, elapsed_time, moves=None, par=None):
     # Create win window
     win = GraphWin("You Won!", GameConfig.WINDOW_WIDTH, GameConfig.WINDOW_HEIGHT)
     win.setBackground("#E8F6F3")
@@ -271,7 +289,8 @@ def win_screen(score, elapsed_time):
 
     stats = Text(
         Point(GameConfig.WINDOW_WIDTH / 2, 200),
-        f"Score: {score} points\nTime: {elapsed_time} secs",
+        f"Score: {score} points\nTime: {elapsed_time} secs" +
+        (f"\nMoves: {moves} (par {par})" if moves is not None and par else ""),
     )
     stats.setSize(18)
     stats.setStyle("bold")
@@ -305,8 +324,9 @@ def win_screen(score, elapsed_time):
     footer.draw(win)
 
     # Wait for click
+    clicks = InputQueue(win)
     while True:
-        pt = win.getMouse()
+        pt = clicks.wait_click()
 
         if restart_btn.clicked(pt):
             win.close()
@@ -316,7 +336,7 @@ def win_screen(score, elapsed_time):
             return "exit"
 
 
-def pause_screen(maze_window):
+def pause_screen(maze_window, input_queue=None):
     # Create a semi-transparent overlay
     overlay = Rectangle(
         Point(0, 0), Point(GameConfig.WINDOW_WIDTH, GameConfig.WINDOW_HEIGHT)
@@ -379,9 +399,11 @@ def pause_screen(maze_window):
     exit_btn.rect.setFill("salmon")
     exit_btn.draw()
 
-    # Wait for click
+    # Wait for click, reusing the game's queue so no input is lost
+    clicks = input_queue or InputQueue(maze_window)
+    clicks.drain()
     while True:
-        pt = maze_window.getMouse()
+        pt = clicks.wait_click()
 
         if resume_btn.clicked(pt):
             overlay.undraw()
@@ -415,18 +437,23 @@ def main():
     GameConfig.PLAYER_COLOR = "blue"
     GameConfig.COIN_COUNT = 10
 
+    # Generate mazes in the background while the menus are up
+    pool = MazePool()
+    pool.fill(maze_spec())
+
     # Display welcome screen
     action = welcome_screen()
 
     while action != "exit":
         if action == "settings":
             settings_screen()
+            pool.fill(maze_spec())
             action = welcome_screen()
             continue
 
         if action == "start" or action == "restart":
             # Initialize components
-            maze = Maze()
+            maze = InfiniteMaze() if GameConfig.INFINITE_MODE else Maze(pool=pool)
             maze.initialize_window()
             maze.draw_maze()
 
@@ -445,53 +472,67 @@ def main():
             exit_btn.rect.setFill("salmon")
             exit_btn.draw()
 
+            # Input arrives through Tk events; the scheduler waits on the
+            # queue, so a key press is handled without waiting out a frame
+            input_queue = InputQueue(maze.window)
+            scheduler = FrameScheduler(maze.window, input_queue=input_queue)
+            maze.scheduler = scheduler
+            scheduler.every(1.0 / GameConfig.COIN_PULSE_FPS, maze.animate_coins)
+            scheduler.every(1.0, maze.update_timer)
+
+            # Effects animate from the frame tick instead of blocking the loop
+            timeline = Timeline()
+            scheduler.every(0, timeline.tick)
+            maze.effects = Effects(timeline)
+            maze.effects.scheduler = scheduler
+
             # Game loop
             is_game_over = False
+            game_won = False
             start_time = time.time()
 
             while not is_game_over:
-                # Check for mouse clicks
-                pt = maze.window.checkMouse()
-                if pt:
-                    if exit_btn.clicked(pt):
-                        # Exit directly to welcome screen
-                        is_game_over = True
-                        maze.window.close()
-                        action = welcome_screen()
+                # Window closed from the title bar
+                if maze.window.isClosed():
+                    input_queue.close()
+                    break
+
+                for event in input_queue.drain():
+                    if event.kind == "click":
+                        if exit_btn.clicked(event.point):
+                            # Exit directly to welcome screen
+                            is_game_over = True
+                            break
+
+                    elif event.key == "Escape":
+                        pause_result = pause_screen(maze.window, input_queue)
+                        if pause_result == "exit":
+                            is_game_over = True
+                            break
+                        # Keys pressed before or during the pause are not
+                        # replayed: drop them and the rest of this batch
+                        input_queue.drain()
                         break
 
-                # Check for key press
-                key = maze.window.checkKey()
-
-                if key == "Escape":
-                    pause_result = pause_screen(maze.window)
-                    if pause_result == "exit":
+                    # Update game state based on key press
+                    elif player.handle_key(event.key):
                         is_game_over = True
-                        maze.window.close()
-                        action = welcome_screen()
+                        game_won = True
                         break
 
-                # Update game state based on key press
-                if key:
-                    game_won = player.handle_key(key)
-
-                    # Update display
-                    maze.update_display()
-
-                    # Check for win condition
+                if is_game_over:
+                    input_queue.close()
+                    maze.window.close()
                     if game_won:
-                        is_game_over = True
                         elapsed_time = int(time.time() - start_time)
-                        maze.window.close()
-                        action = win_screen(maze.score, elapsed_time)
-                        break
-
-                # Small delay for smoother gameplay
-                time.sleep(0.05)
+                        action = win_screen(maze.score, elapsed_time,
+                                            maze.state.moves, maze.state.par_moves())
+                    else:
+                        action = welcome_screen()
+                    break
 
-                # Animate coins
-                if random.random() < 0.1:
-                    maze.animate_coins()
+                # Flush this frame's changes and wait for the next frame
+                scheduler.end_frame()
 
             # Close window if not already closed
             try:
@@ -503,6 +544,11 @@ def main():
         else:
             break
 
+    pool.shutdown()
+
 
-main()
+# The maze pool's worker process imports this module, so only start the
+# game when it is run directly
+if __name__ == "__main__":
+    main()
 
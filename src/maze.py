@@ -1,26 +1,101 @@
 from graphics import *
 from config import GameConfig, CellType
-from drawing_utils import MidpointCircle
-import random
+from coins import CoinAnimator
+from chunks import ChunkedMaze
+from renderer import MazeLayer
+from game_state import GameState, build_from_spec, maze_size, maze_spec
+from maze_id import decode_maze_id, encode_maze_id
+from maze_io import load_maze, read_header, save_maze
+from utils.grid_utils import MazeGrid
 import time
 import math
+import numpy as np
 
 class Maze:
-    def __init__(self):
+    def __init__(self, seed=None, maze_id=None, pool=None, path=None):
         self.width = GameConfig.WINDOW_WIDTH
         self.height = GameConfig.WINDOW_HEIGHT
         self.cell_size = GameConfig.CELL_SIZE
+
+        # Every maze comes from a seeded spec, so its ID rebuilds it exactly
+        built = None
+        if path is not None:
+            # Saved mazes are memory-mapped instead of generated
+            *built, maze_id = load_maze(path)
+        if maze_id is not None:
+            self.spec = decode_maze_id(maze_id)
+        elif path is not None:
+            self.spec = None  # Saved without an ID, so it cannot be rebuilt
+        else:
+            rows, cols = maze_size(self.width, self.height, self.cell_size)
+            self.spec = maze_spec(seed, rows=rows, cols=cols)
+            if seed is None and pool is not None:
+                # A random maze can come ready-made from the pool
+                self.spec, *built = pool.take(self.spec)
+        self.seed = self.spec.seed if self.spec else None
+        self.maze_id = self._maze_id()
+
         self.window = None
-        self.coins = []
-        self.coin_objects = []  # Store coin graphical objects
-        self.score = 0
+        self.coin_animator = None  # Owns the drawn coin circles
+        self.layer = None  # MazeLayer showing the static maze, once drawn
+        self.view_x = 0  # Top-left maze cell shown in the window (the camera)
+        self.view_y = 0
+        self.scheduler = None  # FrameScheduler to report changes to, if any
+        self.effects = None  # Effects playing animations on the game loop, if any
         self.start_time = time.time()
-        self.maze_array = self._create_maze()
+        self.maze_array, coins = built or self._create_maze()
+        # Game logic lives in the state; this maze is its renderer
+        self.state = GameState(self.maze_array, coins, renderer=self, maze_id=self.maze_id)
+
+        # The view is at most one window of cells; bigger mazes scroll
+        bounds = self._bounds()
+        self.view_cols = self.width // self.cell_size
+        self.view_rows = (self.height - 50) // self.cell_size
+        if bounds:
+            self.view_cols = min(self.view_cols, bounds[0])
+            self.view_rows = min(self.view_rows, bounds[1])
+        self.view_x, self.view_y = self._camera(*self.state.position)
+
+    @classmethod
+    def from_id(cls, maze_id):
+        """Rebuild a shared maze, switching to its difficulty preset"""
+        GameConfig.apply_difficulty(decode_maze_id(maze_id).difficulty)
+        return cls(maze_id=maze_id)
+
+    @classmethod
+    def from_file(cls, path):
+        """Open a saved maze file, switching to its difficulty preset if it has an ID"""
+        maze_id = read_header(path).maze_id
+        if maze_id:
+            GameConfig.apply_difficulty(decode_maze_id(maze_id).difficulty)
+        return cls(path=path)
+
+    def save(self, path):
+        """Save the maze, with all of its coins as it started, to a maze file"""
+        grid = MazeGrid(self.maze_array.cells.copy())
+        for x, y in self.state.initial_coins:
+            grid.set(x, y, CellType.COIN.value)
+        save_maze(path, grid, self.state.initial_coins, self.maze_id)
+
+    @property
+    def score(self):
+        return self.state.score
+
+    @property
+    def coins_collected(self):
+        return self.state.coins_collected
+
+    @property
+    def coins(self):
+        """Positions of the coins still to collect (the circles belong to coin_animator)"""
+        return self.state.coins
 
     def initialize_window(self):
         """Create the game window"""
-        self.window = GraphWin(GameConfig.TITLE, self.width, self.height)
+        # Drawing is flushed explicitly (and by the game loop's input checks)
+        self.window = GraphWin(GameConfig.TITLE, self.width, self.height, autoflush=False)
         self.window.setBackground(GameConfig.COLORS["path"])
+        self.coin_animator = CoinAnimator(self.window, self.cell_size / 3)
         self._create_score_display()
 
     def _create_score_display(self):
@@ -32,7 +107,7 @@ class Maze:
         self.score_text.draw(self.window)
 
         # Coin counter display
-        self.coin_counter = Text(Point(200, 20), f"Coins: {self.score // GameConfig.POINTS_PER_COIN}/{GameConfig.COIN_COUNT}")
+        self.coin_counter = Text(Point(200, 20), self._coin_counter_text())
         self.coin_counter.setStyle("bold")
         self.coin_counter.setSize(12)
         self.coin_counter.draw(self.window)
@@ -43,165 +118,156 @@ class Maze:
         self.time_text.setSize(12)
         self.time_text.draw(self.window)
 
+        # Maze ID, for sharing this exact maze
+        if self.maze_id:
+            self.id_text = Text(Point(540, 20), f"Maze {self.maze_id}")
+            self.id_text.setSize(9)
+            self.id_text.setTextColor("#555555")
+            self.id_text.draw(self.window)
+
     def update_display(self):
         """Update score and time display"""
-        self.score_text.setText(f"Score: {self.score}")
-        self.coin_counter.setText(f"Coins: {self.score // GameConfig.POINTS_PER_COIN}/{GameConfig.COIN_COUNT}")
+        self._set_hud_text(self.score_text, f"Score: {self.score}")
+        self._set_hud_text(self.coin_counter, self._coin_counter_text())
+        self.update_timer()
+
+    def update_timer(self):
+        """Update the time display; only redraws when the second changes"""
         elapsed = int(time.time() - self.start_time)
-        self.time_text.setText(f"Time: {elapsed} sec")
+        self._set_hud_text(self.time_text, f"Time: {elapsed} sec")
 
-    def _create_maze(self):
-        """Create random maze using Recursive Backtracking algorithm."""
-        # Calculate maze dimensions based on cell size
-        rows = (self.height - 50) // self.cell_size
-        cols = self.width // self.cell_size
-
-        # Get complexity factor based on difficulty
-        difficulty = GameConfig.DIFFICULTY
-        complexity = GameConfig.DIFFICULTY_SETTINGS[difficulty]["maze_complexity"]
-
-        # Initialize maze with walls
-        maze = [[1 for _ in range(cols)] for _ in range(rows)]
-
-        def carve_path(x, y):
-            maze[y][x] = 0
-
-            # Define directions: right, down, left, up
-            directions = [(2,0), (0,2), (-2,0), (0,-2)]
-            random.shuffle(directions)
-
-
-            if random.random() < complexity:
-                random.shuffle(directions)
-
-            for dx, dy in directions:
-                new_x, new_y = x + dx, y + dy
-                if (0 <= new_x < cols and 0 <= new_y < rows and
-                    maze[new_y][new_x] == 1):
-                    maze[y + dy//2][x + dx//2] = 0
-                    carve_path(new_x, new_y)
-
-        # Start from a random point
-        start_x = random.randrange(1, cols-1, 2)
-        start_y = random.randrange(1, rows-1, 2)
-        carve_path(start_x, start_y)
-
-        # Add start and end positions
-        # Place start near top left
-        start_positions = [(x,y) for y in range(min(5, rows//2))
-                         for x in range(min(5, cols//2))
-                         if maze[y][x] == 0]
-        if start_positions:
-            start_pos = random.choice(start_positions)
-            maze[start_pos[1]][start_pos[0]] = CellType.START.value
-        else:
-            maze[1][1] = CellType.START.value
-
-        # Place end near bottom right
-        end_positions = [(x,y) for y in range(max(rows-5, rows//2), rows)
-                       for x in range(max(cols-5, cols//2), cols)
-                       if maze[y][x] == 0]
-        if end_positions:
-            end_pos = random.choice(end_positions)
-            maze[end_pos[1]][end_pos[0]] = CellType.END.value
-        else:
-            maze[rows-2][cols-2] = CellType.END.value
+    def _set_hud_text(self, text, value):
+        """Change a HUD text if it differs, marking the HUD dirty"""
+        if text.getText() != value:
+            text.setText(value)
+            self.mark_dirty()
 
-        # Add coins
-        self._add_coins(maze)
+    def mark_dirty(self):
+        """Tell the frame scheduler the window changed"""
+        if self.scheduler:
+            self.scheduler.mark_dirty()
 
-        return maze
+    def _coin_counter_text(self):
+        """Text for the coin counter"""
+        return f"Coins: {self.coins_collected}/{self.coins_collected + len(self.coins)}"
 
-    def _add_coins(self, maze):
-        """Add coins to the maze"""
-        # Get coin count from config
-        coin_count = GameConfig.COIN_COUNT
+    def _generation_settings(self):
+        """Return the (algorithm, complexity) for the current difficulty"""
+        settings = GameConfig.DIFFICULTY_SETTINGS[GameConfig.DIFFICULTY]
+        algorithm = GameConfig.MAZE_ALGORITHM or settings.get("maze_algorithm", "backtracker")
+        return algorithm, settings["maze_complexity"]
 
-        # Find all empty cells
-        empty_cells = [(x,y) for y in range(len(maze))
-                    for x in range(len(maze[0]))
-                    if maze[y][x] == 0]
+    def _maze_id(self):
+        """Shareable ID of this maze"""
+        return encode_maze_id(self.spec) if self.spec else None
 
-        # Select random positions for coins
-        if empty_cells:
-            coin_positions = random.sample(empty_cells, min(coin_count, len(empty_cells)))
-            for x, y in coin_positions:
-                maze[y][x] = CellType.COIN.value
-                self.coins.append((x,y))
+    def _create_maze(self):
+        """Create the maze the spec describes, from its seeded generator.
+
+        Returns (grid, coin positions).
+        """
+        return build_from_spec(self.spec)
+
+    def cell_origin(self, x, y):
+        """Window coordinates of the top-left corner of maze cell (x, y)"""
+        return ((x - self.view_x) * self.cell_size,
+                (y - self.view_y) * self.cell_size + self.get_ui_offset())
+
+    def _bounds(self):
+        """(cols, rows) of the maze, or None if it has no edges"""
+        return (self.maze_array.cols, self.maze_array.rows)
+
+    def _camera(self, x, y):
+        """Top-left cell of the view that keeps (x, y) CAMERA_MARGIN cells from its edges.
+
+        The view moves as little as possible from where it is, and stays
+        inside the maze.
+        """
+        bounds = self._bounds() or (None, None)
+        view = []
+        for position, start, size, bound in ((x, self.view_x, self.view_cols, bounds[0]),
+                                             (y, self.view_y, self.view_rows, bounds[1])):
+            margin = min(GameConfig.CAMERA_MARGIN, (size - 1) // 2)
+            start = min(max(start, position - (size - 1 - margin)), position - margin)
+            if bound is not None:
+                start = min(max(start, 0), bound - size)
+            view.append(start)
+        return tuple(view)
+
+    def _visible_cells(self):
+        """Cell values inside the current view, as a 2D array"""
+        return self.maze_array.region(self.view_x, self.view_y, self.view_cols, self.view_rows)
 
     def draw_maze(self):
-        """Draw the maze with visual effects"""
-        # Clear any existing coin objects
-        self.coin_objects = []
-
-        for row in range(len(self.maze_array)):
-            for col in range(len(self.maze_array[0])):
-                x1 = col * self.cell_size
-                y1 = row * self.cell_size + 40
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-
-                cell = Rectangle(Point(x1, y1), Point(x2, y2))
-                cell_type = self.maze_array[row][col]
-
-                if cell_type == CellType.WALL.value:
-                    cell.setFill(GameConfig.COLORS["wall"])
-                elif cell_type == CellType.START.value:
-                    cell.setFill(GameConfig.COLORS["start"])
-                elif cell_type == CellType.END.value:
-                    cell.setFill(GameConfig.COLORS["end"])
-                elif cell_type == CellType.COIN.value:
-                    cell.setFill(GameConfig.COLORS["path"])
-                    # Add yellow circle inside the cell for coin
-                    self._add_coin_effect(x1, y1, x2, y2)
-                else:
-                    cell.setFill(GameConfig.COLORS["path"])
-
-                cell.setOutline(GameConfig.COLORS["grid"])
-                cell.draw(self.window)
-
-                # Add progressive drawing effect
-                if random.random() < 0.1:
-                    time.sleep(0.01)
-                    self.window.update()
-
-    def _add_coin_effect(self, x1, y1, x2, y2):
-        """Add shiny coin using midpoint circle algorithm."""
-        # Create square background first
-        square = Rectangle(Point(x1, y1), Point(x2, y2))
-        square.setFill(GameConfig.COLORS["path"])
-        square.setOutline(GameConfig.COLORS["grid"])
-        square.draw(self.window)
-
-        # Calculate center and radius
-        center_x = (x1 + x2) / 2
-        center_y = (y1 + y2) / 2
-        radius = self.cell_size / 3
-
-        # Create circle for coin using midpoint circle algorithm
-        coin = MidpointCircle(Point(center_x, center_y), radius)
-        coin.setFill(GameConfig.COLORS["coin"])
-        coin.setOutline("gold")
-        coin.draw(self.window)
-
-        # Store coin object for animation
-        self.coin_objects.append(coin)
-
-        return coin
+        """Show the view of the pre-rendered static maze layer, then draw its coins on top"""
+        cells = self._visible_cells()
+        origin_x, origin_y = self.cell_origin(self.view_x, self.view_y)
+        reveal_time = 0
+        if self.layer is None:
+            # Only the first draw is revealed, not every scroll
+            reveal_time = GameConfig.REVEAL_TIME if GameConfig.PROGRESSIVE_REVEAL else 0
+            self.layer = MazeLayer(self.window, self.cell_size)
+        view = (self.view_x, self.view_y, self.view_cols, self.view_rows)
+        self.layer.render(self.maze_array, view, origin_x, origin_y, self._bounds(),
+                          self.maze_id, reveal_time)
+
+        # Coins go on top of the cells
+        for row, col in np.argwhere(cells == CellType.COIN.value).tolist():
+            self._add_coin_effect(col + self.view_x, row + self.view_y)
+        self.window.update()
+
+    def clear_maze(self):
+        """Hide the coins, keeping their circles for the next draw; the maze layer is reused too"""
+        self.coin_animator.clear()
+
+    def mark_visited(self, x, y):
+        """Tint a path cell the player walked over, if GameConfig.VISITED_COLOR is set"""
+        if not GameConfig.VISITED_COLOR or self.layer is None:
+            return
+        if self.maze_array.get(x, y) not in (CellType.PATH.value, CellType.COIN.value):
+            return
+        self.layer.patch_cell(x, y, GameConfig.VISITED_COLOR)
+        self.mark_dirty()
+
+    def player_moved(self, x, y):
+        """Scroll the view to follow the player; returns True if the view was redrawn"""
+        view = self._camera(x, y)
+        if view == (self.view_x, self.view_y):
+            return False
+
+        self.view_x, self.view_y = view
+        self.clear_maze()
+        self.draw_maze()
+        self.mark_dirty()
+        return True
+
+    def _add_coin_effect(self, x, y):
+        """Add shiny coin on maze cell (x, y) using midpoint circle algorithm."""
+        x1, y1 = self.cell_origin(x, y)
+        center = Point(x1 + self.cell_size / 2, y1 + self.cell_size / 2)
+        return self.coin_animator.add((x, y), center)
 
     def collect_coin(self, x, y):
         """Collect coin and increase score"""
-        if (x, y) in self.coins:
-            self.coins.remove((x, y))
-            self.maze_array[y][x] = CellType.PATH.value
-            self.score += GameConfig.POINTS_PER_COIN
+        return self.state.collect_coin(x, y)
+
+    def coin_collected(self, x, y):
+        """Remove a collected coin from the screen and update the HUD"""
+        if self.window:
+            self.coin_animator.remove((x, y))
             self.update_display()
-            return True
-        return False
+            self._play_collect_effect(x, y)
+
+    def _play_collect_effect(self, x, y):
+        """Start the coin sparkle on cell (x, y)"""
+        if self.effects:
+            x1, y1 = self.cell_origin(x, y)
+            self.effects.coin_collect_effect(x1 + self.cell_size / 2, y1 + self.cell_size / 2,
+                                             self.window)
 
     def is_game_won(self, x, y):
         """Check if player has won"""
-        return self.maze_array[y][x] == CellType.END.value
+        return self.state.is_game_won(x, y)
 
     def get_ui_offset(self):
         """Get the Y offset for UI elements"""
@@ -209,22 +275,34 @@ class Maze:
 
     def animate_coins(self):
         """Animate coins with pulsing effect using sine wave."""
-        for coin in self.coin_objects:
-            # Skip if coin was already collected
-            if not coin.canvas:
-                continue
-
-            # Get current radius
-            current_radius = coin.getRadius()
-
-            # Calculate new radius with sine wave
-            t = time.time() * 3
-            scale_factor = 0.1 * math.sin(t) + 1
-
-            # Apply new radius
-            coin.undraw()
-            coin_center = coin.getCenter()
-            coin = MidpointCircle(coin_center, current_radius * scale_factor)
-            coin.setFill(GameConfig.COLORS["coin"])
-            coin.setOutline("gold")
-            coin.draw(self.window)
\ No newline at end of file
+        # The scale is always taken from the base radius, never the current one
+        t = time.time() * 3
+        scale_factor = 0.1 * math.sin(t) + 1
+
+        if self.coin_animator.pulse(scale_factor):
+            self.mark_dirty()
+
+
+class InfiniteMaze(Maze):
+    """Endless maze generated in chunks around the player as they explore.
+
+    The camera follows the player like in a big fixed maze, just without
+    edges to stop at.
+    """
+
+    def _maze_id(self):
+        """Endless mazes are shared by seed, not by maze ID"""
+        return None
+
+    def _create_maze(self):
+        """Create the chunked maze; chunks are generated on demand"""
+        algorithm, complexity = self._generation_settings()
+        return ChunkedMaze(self.seed, algorithm=algorithm, complexity=complexity), ()
+
+    def _bounds(self):
+        """Endless mazes have no edges"""
+        return None
+
+    def _coin_counter_text(self):
+        """Text for the coin counter"""
+        return f"Coins: {self.coins_collected}"
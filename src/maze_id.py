@@ -0,0 +1,112 @@
+"""Compact, shareable maze IDs.
+
+A maze is fully determined by its MazeSpec: the seed of the random.Random
+that generates it, the difficulty preset, the algorithm, its size and the
+number of coins. The ID packs a spec into 23 base32 characters with a
+checksum, so mazes can be shared, rebuilt exactly, and used as cache keys.
+"""
+import base64
+import hashlib
+import random
+import struct
+from collections import OrderedDict, namedtuple
+
+MazeSpec = namedtuple("MazeSpec", ["seed", "difficulty", "algorithm", "rows", "cols", "coin_count"])
+
+ID_VERSION = 1
+SEED_MASK = 0xFFFFFFFF  # Seeds are 32-bit
+
+# Fixed codes, so IDs stay valid when presets or generators are added
+DIFFICULTY_CODES = ("easy", "medium", "hard")
+ALGORITHM_CODES = ("backtracker", "binary_tree", "prim", "kruskal", "wilson", "ellers")
+
+_ID_FORMAT = struct.Struct("<BBBHHHI")
+
+
+def new_seed():
+    """A fresh 32-bit maze seed."""
+    return random.randrange(SEED_MASK + 1)
+
+
+def _checksum(data):
+    return hashlib.blake2b(data, digest_size=1).digest()
+
+
+def encode_maze_id(spec):
+    """Pack a MazeSpec into its ID string; raises ValueError if a field does not fit."""
+    try:
+        difficulty = DIFFICULTY_CODES.index(spec.difficulty)
+        algorithm = ALGORITHM_CODES.index(spec.algorithm)
+    except ValueError:
+        raise ValueError(f"maze spec cannot be encoded: {spec}") from None
+    try:
+        # Out of range fields (a seed over 32 bits, more than 65535 rows...)
+        # are refused rather than masked, which would name a different maze
+        data = _ID_FORMAT.pack(ID_VERSION, difficulty, algorithm, spec.rows, spec.cols,
+                               spec.coin_count, spec.seed)
+    except struct.error:
+        raise ValueError(f"maze spec cannot be encoded: {spec}") from None
+    return base64.b32encode(data + _checksum(data)).decode("ascii").rstrip("=")
+
+
+def decode_maze_id(maze_id):
+    """Unpack an ID string into its MazeSpec; raises ValueError if it is not valid."""
+    text = maze_id.strip().upper().replace("-", "")
+    try:
+        raw = base64.b32decode(text + "=" * (-len(text) % 8))
+    except ValueError:
+        raise ValueError(f"not a maze ID: {maze_id!r}") from None
+    data, checksum = raw[:-1], raw[-1:]
+    if len(data) != _ID_FORMAT.size or _checksum(data) != checksum:
+        raise ValueError(f"not a maze ID: {maze_id!r}")
+
+    version, difficulty, algorithm, rows, cols, coin_count, seed = _ID_FORMAT.unpack(data)
+    if version != ID_VERSION:
+        raise ValueError(f"maze ID version {version} is not supported")
+    if difficulty >= len(DIFFICULTY_CODES) or algorithm >= len(ALGORITHM_CODES):
+        raise ValueError(f"not a maze ID: {maze_id!r}")
+    return MazeSpec(seed, DIFFICULTY_CODES[difficulty], ALGORITHM_CODES[algorithm],
+                    rows, cols, coin_count)
+
+
+class DerivedCache:
+    """LRU cache of data derived from mazes (solutions, images...).
+
+    Entries are keyed by (maze ID, name); since an ID always rebuilds the
+    same maze, anything computed from it can be reused.
+    """
+
+    def __init__(self, maxsize=64):
+        """Create an empty cache holding at most maxsize entries."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    def get(self, maze_id, name, build):
+        """Return the cached value, calling build() to make it on a miss."""
+        key = (maze_id, name)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        value = build()
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drop everything and reset the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# Derived data shared by every maze in this process
+derived_cache = DerivedCache()
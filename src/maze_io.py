@@ -0,0 +1,146 @@
+"""Binary maze files, loaded by memory-mapping them.
+
+A file is a 64-byte header followed by the cells, one uint8 per cell in
+row-major order (the layout MazeGrid keeps in memory), then the coin
+positions as little-endian uint32 (x, y) pairs:
+
+    offset 0   magic "MAZE", version, flags, rows, cols, start, end,
+               coin count and the maze ID (empty if there is none)
+    offset 64  rows * cols cells
+    then       coin positions, aligned to 4 bytes
+
+Loading maps the file copy-on-write and wraps the cells without copying
+them, so even very large mazes open at once, and collecting coins never
+writes back to the file.
+
+Usage:
+    python src/maze_io.py save FILE [--id MAZE_ID | --rows R --cols C ...]
+    python src/maze_io.py info FILE
+"""
+import argparse
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from utils.grid_utils import MazeGrid
+
+MAGIC = b"MAZE"
+FORMAT_VERSION = 1
+NO_POSITION = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sBBHIIIIIII24s4x")
+
+MazeFileHeader = namedtuple("MazeFileHeader", ["rows", "cols", "start", "end", "coin_count", "maze_id"])
+
+
+def _coins_offset(rows, cols):
+    return _HEADER.size + (rows * cols + 3) // 4 * 4
+
+
+def _pack_position(position):
+    return (NO_POSITION, NO_POSITION) if position is None else position
+
+
+def _unpack_position(x, y):
+    return None if x == NO_POSITION else (x, y)
+
+
+def save_maze(path, grid, coins, maze_id=None):
+    """Write a MazeGrid and its coin positions to a maze file."""
+    cells = np.ascontiguousarray(grid.cells, dtype=np.uint8)
+    rows, cols = cells.shape
+    coins = np.asarray(list(coins), dtype="<u4").reshape(-1, 2)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, 0, rows, cols,
+        *_pack_position(grid.find_start()), *_pack_position(grid.find_end()),
+        len(coins), (maze_id or "").encode("ascii"),
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(cells.data)
+        f.write(bytes(_coins_offset(rows, cols) - _HEADER.size - cells.size))
+        f.write(coins.data)
+
+
+def _read_header(buffer, size, path):
+    if size < _HEADER.size:
+        raise ValueError(f"{path} is not a maze file")
+    (magic, version, _flags, _reserved, rows, cols, start_x, start_y, end_x, end_y,
+     coin_count, maze_id) = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a maze file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"maze file version {version} is not supported")
+    if size < _coins_offset(rows, cols) + coin_count * 8:
+        raise ValueError(f"{path} is truncated")
+    return MazeFileHeader(rows, cols, _unpack_position(start_x, start_y),
+                          _unpack_position(end_x, end_y), coin_count,
+                          maze_id.rstrip(b"\0").decode("ascii") or None)
+
+
+def read_header(path):
+    """Read just the header of a maze file."""
+    with open(path, "rb") as f:
+        return _read_header(f.read(_HEADER.size), os.fstat(f.fileno()).st_size, path)
+
+
+def load_maze(path):
+    """Memory-map a maze file. Returns (grid, coins, maze_id).
+
+    The grid's cells are a view of the mapping (copy-on-write), which
+    stays open for as long as the grid uses it.
+    """
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except ValueError:  # Empty file
+            raise ValueError(f"{path} is not a maze file") from None
+    header = _read_header(buffer, len(buffer), path)
+
+    cells = np.frombuffer(buffer, dtype=np.uint8, count=header.rows * header.cols,
+                          offset=_HEADER.size)
+    grid = MazeGrid(cells.reshape(header.rows, header.cols))
+    coins = np.frombuffer(buffer, dtype="<u4", count=header.coin_count * 2,
+                          offset=_coins_offset(header.rows, header.cols))
+    return grid, [tuple(position) for position in coins.reshape(-1, 2).tolist()], header.maze_id
+
+
+def main(argv=None):
+    from config import GameConfig
+    from game_state import build_from_spec, maze_size, maze_spec
+    from maze_id import decode_maze_id, encode_maze_id
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    save = commands.add_parser("save", help="generate a maze and save it")
+    save.add_argument("file")
+    save.add_argument("--id", help="maze ID to rebuild")
+    save.add_argument("--seed", type=int)
+    save.add_argument("--difficulty", choices=["easy", "medium", "hard"])
+    save.add_argument("--algorithm")
+    save.add_argument("--rows", type=int)
+    save.add_argument("--cols", type=int)
+    save.add_argument("--coins", type=int)
+    info = commands.add_parser("info", help="show a maze file's header")
+    info.add_argument("file")
+    options = parser.parse_args(argv)
+
+    if options.command == "save":
+        if options.id:
+            spec = decode_maze_id(options.id)
+        else:
+            settings = GameConfig.DIFFICULTY_SETTINGS[options.difficulty or GameConfig.DIFFICULTY]
+            rows, cols = maze_size(cell_size=settings["cell_size"])
+            spec = maze_spec(options.seed, options.difficulty, options.algorithm,
+                             options.rows or rows, options.cols or cols,
+                             settings["coin_count"] if options.coins is None else options.coins)
+        grid, coins = build_from_spec(spec)
+        save_maze(options.file, grid, coins, encode_maze_id(spec))
+    print(read_header(options.file))
+
+
+if __name__ == "__main__":
+    main()
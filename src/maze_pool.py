@@ -0,0 +1,83 @@
+"""Mazes generated ahead of time in a background worker process.
+
+Starting or restarting a game takes a ready maze from the pool instead of
+generating one on the UI thread; the pool then queues a replacement, so
+generation runs on a spare core while the player is busy.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from config import GameConfig
+from game_state import build_from_spec
+from maze_id import new_seed
+
+
+def _build(spec):
+    """Worker entry point: generate the maze for spec."""
+    grid, coins = build_from_spec(spec)
+    return spec, grid, coins
+
+
+def _default_executor():
+    """One worker process; a thread when processes are not available."""
+    try:
+        return ProcessPoolExecutor(max_workers=1)
+    except (ImportError, NotImplementedError, OSError):
+        return ThreadPoolExecutor(max_workers=1)
+
+
+class MazePool:
+    """Keeps up to size ready-made mazes for each maze shape.
+
+    Mazes are grouped by their spec without the seed (difficulty,
+    algorithm, size and coins), so changing the settings simply starts
+    filling another group. Each taken maze gets a fresh seed.
+    """
+
+    def __init__(self, size=None, executor=None):
+        """Create an empty pool; workers start on the first fill."""
+        self.size = GameConfig.MAZE_POOL_SIZE if size is None else size
+        self.executor = executor or _default_executor()
+        self.ready = {}  # spec without seed -> deque of futures
+
+    @staticmethod
+    def _key(spec):
+        return spec._replace(seed=0)
+
+    def fill(self, spec):
+        """Queue mazes until the group for spec holds size of them."""
+        queue = self.ready.setdefault(self._key(spec), deque())
+        while len(queue) < self.size:
+            queue.append(self.executor.submit(_build, spec._replace(seed=new_seed())))
+
+    def take(self, spec):
+        """Return (spec, grid, coins) for a maze shaped like spec.
+
+        Uses the oldest pooled maze, waiting for it if it is still being
+        built; with nothing pooled (or a failed worker) the maze is built
+        here from spec. The group is topped up again either way.
+        """
+        queue = self.ready.get(self._key(spec))
+        built = None
+        if queue:
+            try:
+                built = queue.popleft().result()
+            except Exception:
+                # A broken worker must not stop the game from starting
+                built = None
+        if built is None:
+            built = _build(spec)
+        self.fill(spec)
+        return built
+
+    def pending(self, spec):
+        """Number of pooled mazes (ready or in progress) shaped like spec."""
+        return len(self.ready.get(self._key(spec), ()))
+
+    def shutdown(self):
+        """Drop pooled mazes and stop the worker."""
+        for queue in self.ready.values():
+            for future in queue:
+                future.cancel()
+        self.ready.clear()
+        self.executor.shutdown(wait=False)
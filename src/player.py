@@ -1,31 +1,22 @@
 from graphics import *
-from config import GameConfig, CellType
+from config import GameConfig
 from drawing_utils import MidpointCircle
+from game_state import KEY_DIRECTIONS
 
 class Player:
     def __init__(self, maze):
         self.maze = maze
+        self.state = maze.state
         self.cell_size = GameConfig.CELL_SIZE
-        self.position = self._find_start_position()
-        self.x, self.y = self.position
+        self.x, self.y = self.state.position
         self.character = None
         self.highlight = None
         self.color = GameConfig.PLAYER_COLOR
         self.ui_offset = self.maze.get_ui_offset()
 
-    def _find_start_position(self):
-        """Find the starting position in the maze"""
-        for y in range(len(self.maze.maze_array)):
-            for x in range(len(self.maze.maze_array[0])):
-                if self.maze.maze_array[y][x] == CellType.START.value:
-                    return (x, y)
-        # Fallback to position (1,1) if no start is found
-        return (1, 1)
-
     def draw(self):
         """Draw player using midpoint circle with 3D highlight."""
-        x1 = self.x * self.cell_size
-        y1 = self.y * self.cell_size + self.ui_offset
+        x1, y1 = self.maze.cell_origin(self.x, self.y)
         center_x = x1 + self.cell_size / 2
         center_y = y1 + self.cell_size / 2
 
@@ -77,67 +68,38 @@ class Player:
 
     def move(self, dx, dy):
         """Move player if the target cell is valid"""
-        new_x = self.x + dx
-        new_y = self.y + dy
-
         # Check if the move is valid (not a wall)
-        if (0 <= new_x < len(self.maze.maze_array[0]) and
-            0 <= new_y < len(self.maze.maze_array) and
-            self.maze.maze_array[new_y][new_x] != CellType.WALL.value):
-
-            # Restore the color of the cell we're leaving
-            old_cell_x1 = self.x * self.cell_size
-            old_cell_y1 = self.y * self.cell_size + self.ui_offset
-            old_cell_x2 = old_cell_x1 + self.cell_size
-            old_cell_y2 = old_cell_y1 + self.cell_size
-
-            # Determine correct color based on cell type
-            old_cell_type = self.maze.maze_array[self.y][self.x]
-            if old_cell_type == CellType.START.value:
-                color = GameConfig.COLORS["start"]
-            elif old_cell_type == CellType.END.value:
-                color = GameConfig.COLORS["end"]
-            else:
-                color = GameConfig.COLORS["path"]
+        if not self.state.can_move(dx, dy):
+            return False
 
-            # Draw rectangle with correct color
-            old_cell = Rectangle(Point(old_cell_x1, old_cell_y1), Point(old_cell_x2, old_cell_y2))
-            old_cell.setFill(color)
-            old_cell.setOutline(GameConfig.COLORS["grid"])
-            old_cell.draw(self.maze.window)
+        # Patch the cell we're leaving in the maze layer instead of drawing over it
+        self.maze.mark_visited(self.x, self.y)
 
-            # Update position
-            self.x, self.y = new_x, new_y
+        # Move in the game state; the maze follows along and collects coins
+        view = (self.maze.view_x, self.maze.view_y)
+        game_won = self.state.move(dx, dy)
+        self.x, self.y = self.state.position
 
-            # Check for coin collection
-            if self.maze.maze_array[self.y][self.x] == CellType.COIN.value:
-                self.maze.collect_coin(self.x, self.y)
+        # Stay on top if the maze redrew its view
+        if (self.maze.view_x, self.maze.view_y) != view:
+            self._redraw_character()
 
-            # Calculate new center position
-            new_cell_x1 = self.x * self.cell_size
-            new_cell_y1 = self.y * self.cell_size + self.ui_offset
-            new_center_x = new_cell_x1 + self.cell_size / 2
-            new_center_y = new_cell_y1 + self.cell_size / 2
+        # Calculate new center position
+        new_cell_x1, new_cell_y1 = self.maze.cell_origin(self.x, self.y)
+        new_center_x = new_cell_x1 + self.cell_size / 2
+        new_center_y = new_cell_y1 + self.cell_size / 2
 
-            # Move the player character to the new position
-            self.move_character(new_center_x, new_center_y)
+        # Move the player character to the new position
+        self.move_character(new_center_x, new_center_y)
+        self.maze.mark_dirty()
 
-            # Check for win condition
-            if self.maze.is_game_won(self.x, self.y):
-                return True
-
-        return False
+        return game_won
 
     def handle_key(self, key):
         """Process keyboard input for movement"""
-        if key == "Up" or key == "w":
-            return self.move(0, -1)
-        elif key == "Down" or key == "s":
-            return self.move(0, 1)
-        elif key == "Left" or key == "a":
-            return self.move(-1, 0)
-        elif key == "Right" or key == "d":
-            return self.move(1, 0)
+        direction = KEY_DIRECTIONS.get(key)
+        if direction:
+            return self.move(*direction)
         return False
 
     def set_color(self, color):
@@ -148,10 +110,15 @@ class Player:
 
             # If character exists, update its color
             if self.character:
-                self.character.undraw()
-                self.highlight.undraw()
-                self.character = None
-                self.highlight = None
-                self.draw()
+                self._redraw_character()
             return True
-        return False
\ No newline at end of file
+        return False
+
+    def _redraw_character(self):
+        """Recreate the character and highlight on top of everything else"""
+        if self.character:
+            self.character.undraw()
+            self.highlight.undraw()
+            self.character = None
+            self.highlight = None
+            self.draw()
\ No newline at end of file
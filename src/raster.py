@@ -0,0 +1,209 @@
+"""Raster algorithms as pure pixel math, shared by every drawing backend.
+
+Nothing here needs a window: drawing_utils turns the pixels into canvas
+items and framebuffer writes them into a NumPy image.
+"""
+import math
+
+import numpy as np
+
+
+def _isqrt(values):
+    """Elementwise integer square root of a non-negative int64 array."""
+    roots = np.sqrt(values.astype(np.float64)).astype(np.int64)
+    roots -= roots * roots > values
+    roots += (roots + 1) * (roots + 1) <= values
+    return roots
+
+
+def _group_offsets(counts):
+    """For groups of the given sizes laid end to end: (group, offset in group) per element."""
+    group = np.repeat(np.arange(counts.size), counts)
+    starts = np.cumsum(counts) - counts
+    return group, np.arange(group.size) - starts[group]
+
+
+def midpoint_circles(center_xs, center_ys, radii):
+    """Outline pixels of many midpoint circles at once.
+
+    Returns (xs, ys, index) arrays, index naming the circle each pixel
+    belongs to. Each circle gets the pixels of the classic midpoint loop,
+    in the same order: at step x (0, 1, ...) the loop's y is the largest
+    with y * (y - 1) < r*r - x*x, except that y drops by at most one per
+    step, and the loop stops after the first step with x >= y.
+    """
+    radii = np.maximum(np.asarray(radii, dtype=np.float64).astype(np.int64).ravel(), 1)
+    steps = _isqrt(radii * radii // 2) + 3  # Enough steps to pass x >= y
+    index, x = _group_offsets(steps)
+
+    r = radii[index]
+    y = (_isqrt(4 * np.maximum(r * r - x * x, 0)) + 1) // 2
+    y_before = (_isqrt(4 * np.maximum(r * r - (x - 1) * (x - 1), 0)) + 1) // 2
+    y = np.where(x > 0, np.maximum(y, y_before - 1), y)
+
+    # Keep each circle's steps up to and including its first x >= y
+    done = np.where(x >= y, x, np.iinfo(np.int64).max)
+    last = np.minimum.reduceat(done, np.cumsum(steps) - steps)
+    keep = x <= last[index]
+    index, x, y = index[keep], x[keep], y[keep]
+
+    # The 8-way symmetric points of each step
+    octant_x = np.stack((x, -x, x, -x, y, -y, y, -y), axis=1).ravel()
+    octant_y = np.stack((y, y, -y, -y, x, x, -x, -x), axis=1).ravel()
+    index = np.repeat(index, 8)
+    xs = np.asarray(center_xs).ravel()[index] + octant_x
+    ys = np.asarray(center_ys).ravel()[index] + octant_y
+    return xs, ys, index
+
+
+def midpoint_circle_points(radius):
+    """Compute circle outline points around (0, 0) using the midpoint algorithm."""
+    xs, ys, _ = midpoint_circles([0], [0], [radius])
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def circle_outline(radius):
+    """Midpoint circle points ordered around the circle, usable as polygon vertices."""
+    return sorted(set(midpoint_circle_points(radius)), key=lambda p: math.atan2(p[1], p[0]))
+
+
+def bresenham_lines(x1s, y1s, x2s, y2s):
+    """Pixels of many Bresenham lines at once, endpoints rounded to whole pixels.
+
+    Returns (xs, ys, index) arrays, index naming the line each pixel
+    belongs to. Pixel i along the major axis is offset on the minor axis
+    by (2*i*minor + major - 1) // (2*major), which is exactly where the
+    step-by-step error loop puts it.
+    """
+    x1s, y1s, x2s, y2s = (np.rint(np.asarray(v, dtype=np.float64)).astype(np.int64).ravel()
+                          for v in (x1s, y1s, x2s, y2s))
+    dx = np.abs(x2s - x1s)
+    dy = np.abs(y2s - y1s)
+    major = np.maximum(dx, dy)
+    minor = np.minimum(dx, dy)
+    index, i = _group_offsets(major + 1)
+
+    # A single-pixel line (major == 0) has no minor offset
+    step = np.maximum(2 * i * minor[index] + major[index] - 1, 0) // np.maximum(2 * major[index], 1)
+    x_major = (dx >= dy)[index]
+    xs = x1s[index] + np.where(x2s > x1s, 1, -1)[index] * np.where(x_major, i, step)
+    ys = y1s[index] + np.where(y2s > y1s, 1, -1)[index] * np.where(x_major, step, i)
+    return xs, ys, index
+
+
+def bresenham_points(x1, y1, x2, y2):
+    """Pixels of the line from (x1, y1) to (x2, y2), endpoints rounded to whole pixels."""
+    xs, ys, _ = bresenham_lines([x1], [y1], [x2], [y2])
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def pixel_runs(xs, ys, index=None):
+    """Merge consecutive pixels of a path into straight runs.
+
+    A run continues while each pixel moves along one axis only, so a
+    rasterized line becomes a few horizontal or vertical strips. Returns
+    (left, top, right, bottom, index) arrays, one entry per run; runs
+    never span two values of index.
+    """
+    xs = np.asarray(xs).ravel()
+    ys = np.asarray(ys).ravel()
+    index = np.zeros(xs.size, dtype=np.int64) if index is None else np.asarray(index).ravel()
+    if xs.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, empty, empty
+
+    breaks = ((xs[1:] != xs[:-1]) & (ys[1:] != ys[:-1])) | (index[1:] != index[:-1])
+    starts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+    return (np.minimum.reduceat(xs, starts), np.minimum.reduceat(ys, starts),
+            np.maximum.reduceat(xs, starts), np.maximum.reduceat(ys, starts), index[starts])
+
+
+def circle_spans(radius):
+    """Horizontal spans filling a circle around (0, 0), as (dy, left, right) rows of an array.
+
+    Each row reaches out to the midpoint outline, so a filled circle and
+    its outline cover the same pixels.
+    """
+    xs, ys, _ = midpoint_circles([0], [0], [radius])
+    rows, row_of = np.unique(ys, return_inverse=True)
+    reach = np.zeros(rows.size, dtype=np.int64)
+    np.maximum.at(reach, row_of, xs)
+    return np.column_stack((rows, -reach, reach))
+
+
+def polygon_spans(vertices):
+    """Scanline-fill a polygon; returns (ys, lefts, rights) arrays of pixel spans.
+
+    An active-edge-table fill: each edge is active on the scanlines whose
+    pixel centers (y + 0.5) fall in [top, bottom) of the edge, where it
+    crosses at x = x_top + (y + 0.5 - y_top) * dx/dy. The crossings of every
+    scanline are sorted and paired even-odd, and each pair covers the
+    pixels whose centers lie between them. Touching spans on a row are
+    joined, so each row has as few spans as possible.
+    """
+    points = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    starts = points
+    ends = np.roll(points, -1, axis=0)
+
+    # Edge table: horizontal edges never cross a scanline center
+    sloped = starts[:, 1] != ends[:, 1]
+    starts, ends = starts[sloped], ends[sloped]
+    top = np.where(starts[:, 1] < ends[:, 1], 0, 1)
+    upper = np.where(top[:, None] == 0, starts, ends)
+    lower = np.where(top[:, None] == 0, ends, starts)
+    first_row = np.ceil(upper[:, 1] - 0.5).astype(np.int64)
+    row_count = np.maximum(np.ceil(lower[:, 1] - 0.5).astype(np.int64) - first_row, 0)
+    if row_count.sum() == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    # Every (edge, scanline) pair where the edge is active, and its crossing
+    edge, offset = _group_offsets(row_count)
+    ys = first_row[edge] + offset
+    inverse_slope = (lower[:, 0] - upper[:, 0]) / (lower[:, 1] - upper[:, 1])
+    xs = upper[edge, 0] + (ys + 0.5 - upper[edge, 1]) * inverse_slope[edge]
+
+    # Sort crossings along each scanline and pair them up (even-odd rule)
+    order = np.lexsort((xs, ys))
+    ys, xs = ys[order][0::2], (xs[order][0::2], xs[order][1::2])
+    lefts = np.ceil(xs[0] - 0.5).astype(np.int64)
+    rights = np.ceil(xs[1] - 0.5).astype(np.int64) - 1
+    filled = lefts <= rights
+    return _join_touching(ys[filled], lefts[filled], rights[filled])
+
+
+def _join_touching(ys, lefts, rights):
+    """Join spans that touch on the same row; spans are sorted and do not overlap."""
+    if ys.size == 0:
+        return ys, lefts, rights
+    joins = (ys[1:] == ys[:-1]) & (lefts[1:] == rights[:-1] + 1)
+    first = np.flatnonzero(np.concatenate(([True], ~joins)))
+    return ys[first], lefts[first], np.maximum.reduceat(rights, first)
+
+
+def merge_spans(ys, lefts, rights, keys=None):
+    """Stack identical spans on consecutive rows into rectangles.
+
+    Returns (lefts, tops, rights, bottoms, keys) arrays sorted by (top,
+    left), with bottoms inclusive. Spans only stack when their keys (a
+    color, say) match as well.
+    """
+    ys = np.asarray(ys, dtype=np.int64).ravel()
+    lefts = np.asarray(lefts, dtype=np.int64).ravel()
+    rights = np.asarray(rights, dtype=np.int64).ravel()
+    keys = np.zeros(ys.size, dtype=np.int64) if keys is None else np.asarray(keys).ravel()
+    if ys.size == 0:
+        return lefts, ys, rights, ys, keys
+
+    # Sort spans by shape, then row: a rectangle is a run of consecutive rows
+    order = np.lexsort((ys, rights, lefts, keys))
+    ys, lefts, rights, keys = ys[order], lefts[order], rights[order], keys[order]
+    same = ((lefts[1:] == lefts[:-1]) & (rights[1:] == rights[:-1]) &
+            (keys[1:] == keys[:-1]) & (ys[1:] == ys[:-1] + 1))
+    first = np.flatnonzero(np.concatenate(([True], ~same)))
+    last = np.concatenate((first[1:], [ys.size])) - 1
+
+    tops = ys[first]
+    order = np.lexsort((lefts[first], tops))
+    return (lefts[first][order], tops[order], rights[first][order], ys[last][order],
+            keys[first][order])
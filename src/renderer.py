@@ -0,0 +1,211 @@
+from config import GameConfig, CellType
+from raster import merge_spans
+from framebuffer import Framebuffer, parse_color
+from maze_id import DerivedCache
+import time
+import numpy as np
+
+# GameConfig.COLORS entry used for each cell type; coins sit on a path cell
+CELL_COLOR_KEYS = {
+    CellType.WALL.value: "wall",
+    CellType.PATH.value: "path",
+    CellType.START.value: "start",
+    CellType.END.value: "end",
+    CellType.COIN.value: "path",
+}
+
+# Side, in cells, of the tiles patches are filed under
+PATCH_TILE = 16
+
+# Cell value -> small color code, so runs can be found with array operations
+_COLOR_NAMES = sorted(set(CELL_COLOR_KEYS.values()))
+_COLOR_CODES = np.zeros(256, dtype=np.uint8)
+for _value, _key in CELL_COLOR_KEYS.items():
+    _COLOR_CODES[_value] = _COLOR_NAMES.index(_key)
+
+
+def merge_cell_runs(cells, skip_key=None):
+    """Merge a 2D array of cells into as few same-colored rectangles as possible.
+
+    Neighbouring cells of one color in a row form a run, and identical runs
+    on consecutive rows are stacked into one rectangle (the same span
+    merging the scanline fills use). Returns a list of
+    (col, row, width, height, color_key) in top-to-bottom order. Runs whose
+    color key is skip_key are left out.
+    """
+    codes = _COLOR_CODES[np.asarray(cells, dtype=np.uint8)]
+    rows, cols = codes.shape
+
+    # Run starts: column 0 plus every column where the color changes
+    starts = np.ones((rows, cols), dtype=bool)
+    starts[:, 1:] = codes[:, 1:] != codes[:, :-1]
+    ys, lefts = np.nonzero(starts)
+    same_row = np.append(ys[1:] == ys[:-1], False)
+    rights = np.where(same_row, np.append(lefts[1:], 0) - 1, cols - 1)
+    keys = codes[ys, lefts]
+    if skip_key in _COLOR_NAMES:
+        keep = keys != _COLOR_NAMES.index(skip_key)
+        ys, lefts, rights, keys = ys[keep], lefts[keep], rights[keep], keys[keep]
+
+    lefts, tops, rights, bottoms, keys = merge_spans(ys, lefts, rights, keys)
+    return [(left, top, right - left + 1, bottom - top + 1, _COLOR_NAMES[key])
+            for left, top, right, bottom, key in zip(lefts.tolist(), tops.tolist(), rights.tolist(),
+                                                     bottoms.tolist(), keys.tolist())]
+
+
+layer_cache = DerivedCache(maxsize=4)
+
+
+def render_maze_layer(cells, cell_size):
+    """Rasterize the static maze (cell colors and grid lines) into a Framebuffer.
+
+    Coins are not part of the layer: coin cells get the path color.
+    """
+    rows, cols = np.shape(cells)
+    layer = Framebuffer(cols * cell_size + 1, rows * cell_size + 1, GameConfig.COLORS["path"])
+    for col, row, width, height, key in merge_cell_runs(cells, "path"):
+        layer.fill_rect(col * cell_size, row * cell_size,
+                        (col + width) * cell_size, (row + height) * cell_size, GameConfig.COLORS[key])
+
+    # One pixel line per grid boundary
+    grid = parse_color(GameConfig.COLORS["grid"])
+    layer.pixels[::cell_size, :] = grid
+    layer.pixels[:, ::cell_size] = grid
+    return layer
+
+
+class MazeLayer:
+    """The static maze pre-rendered into one image under everything else.
+
+    Only the cells in view plus GameConfig.VIEW_MARGIN cells around them
+    are rasterized, into an off-screen area; the view is copied out of it
+    into a Framebuffer shown as a single canvas image. Scrolling inside
+    the area only copies pixels, and scrolling past it rasterizes a new
+    area around the view, so the cost follows the window size rather than
+    the maze size. An area holding the whole maze is cached by maze ID.
+    Later changes to a cell, such as a visited tint, are patched into the
+    pixels in place, so the canvas item count stays the same for the
+    whole game.
+    """
+
+    def __init__(self, window, cell_size):
+        """Create an empty layer for window; nothing is drawn until render()."""
+        self.window = window
+        self.cell_size = cell_size
+        self.framebuffer = None
+        self.origin = (0, 0)
+        self.area = None  # (x, y, cols, rows, pixels) of the rasterized cells
+        self.view = None  # (x, y, cols, rows) of the cells shown
+        self.patches = {}  # (x, y) tile -> {(x, y) maze cell: color patched over it}
+
+    def render(self, grid, view, origin_x, origin_y, bounds=None, cache_key=None, reveal_time=0):
+        """Show the view (x, y, cols, rows) of grid with its top-left corner at (origin_x, origin_y).
+
+        grid is anything with region(x, y, width, height), like MazeGrid or
+        ChunkedMaze; bounds is its (cols, rows), or None for an endless
+        grid. With reveal_time > 0 the view is revealed row by row, spread
+        over at most that many seconds.
+        """
+        view_x, view_y, cols, rows = view
+        if not self._area_holds(view):
+            self._rasterize(grid, view, bounds, cache_key)
+
+        area_x, area_y, _, _, pixels = self.area
+        cell_size = self.cell_size
+        top, left = (view_y - area_y) * cell_size, (view_x - area_x) * cell_size
+        self.view = view
+        self._present(pixels[top:top + rows * cell_size + 1, left:left + cols * cell_size + 1],
+                      origin_x, origin_y, reveal_time)
+
+    def _area_holds(self, view):
+        """Check if the rasterized area covers the whole view"""
+        if self.area is None:
+            return False
+        view_x, view_y, cols, rows = view
+        area_x, area_y, area_cols, area_rows, _ = self.area
+        return (area_x <= view_x and view_x + cols <= area_x + area_cols and
+                area_y <= view_y and view_y + rows <= area_y + area_rows)
+
+    def _rasterize(self, grid, view, bounds, cache_key):
+        """Rasterize the view plus the margin around it, clipped to bounds"""
+        view_x, view_y, cols, rows = view
+        margin = GameConfig.VIEW_MARGIN
+        x1, y1 = view_x - margin, view_y - margin
+        x2, y2 = view_x + cols + margin, view_y + rows + margin
+        whole = False
+        if bounds is not None:
+            x1, y1 = max(x1, 0), max(y1, 0)
+            x2, y2 = min(x2, bounds[0]), min(y2, bounds[1])
+            whole = (x1, y1, x2, y2) == (0, 0) + tuple(bounds)
+
+        def build():
+            return render_maze_layer(grid.region(x1, y1, x2 - x1, y2 - y1), self.cell_size)
+
+        if whole and cache_key is not None:
+            # Copied, so patches never reach the shared cache
+            pixels = layer_cache.get(cache_key, f"layer{self.cell_size}", build).pixels.copy()
+        else:
+            pixels = build().pixels
+        self.area = (x1, y1, x2 - x1, y2 - y1, pixels)
+
+        # Replay only the patches filed under tiles the area overlaps
+        for tile_y in range(y1 // PATCH_TILE, (y2 - 1) // PATCH_TILE + 1):
+            for tile_x in range(x1 // PATCH_TILE, (x2 - 1) // PATCH_TILE + 1):
+                for (x, y), color in self.patches.get((tile_x, tile_y), {}).items():
+                    self._patch_area(x, y, color)
+
+    def _present(self, pixels, origin_x, origin_y, reveal_time=0):
+        """Show pixels at (origin_x, origin_y), reusing the image when the size allows"""
+        # Reusing the presented image means no item is added
+        if (self.framebuffer is None or self.origin != (origin_x, origin_y)
+                or self.framebuffer.pixels.shape != pixels.shape):
+            self.hide()
+            height, width = pixels.shape[:2]
+            self.framebuffer = Framebuffer(width, height, GameConfig.COLORS["path"])
+            self.origin = (origin_x, origin_y)
+
+        if reveal_time > 0:
+            self._reveal(pixels, reveal_time)
+        self.framebuffer.pixels[:] = pixels
+        self.framebuffer.present(self.window, origin_x, origin_y, below=True)
+
+    def _reveal(self, pixels, reveal_time):
+        """Present the pixels one row of cells at a time"""
+        self.framebuffer.clear()
+        rows = (pixels.shape[0] - 1) // self.cell_size
+        start_time = time.time()
+        for row in range(1, rows):
+            self.framebuffer.pixels[:row * self.cell_size] = pixels[:row * self.cell_size]
+            self.framebuffer.present(self.window, *self.origin, below=True)
+            self.window.update()
+            delay = start_time + reveal_time * row / rows - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _patch_area(self, x, y, color):
+        """Recolor the inside of maze cell (x, y) in the area, if it is there"""
+        area_x, area_y, cols, rows, pixels = self.area
+        col, row = x - area_x, y - area_y
+        if 0 <= col < cols and 0 <= row < rows:
+            x1, y1 = col * self.cell_size + 1, row * self.cell_size + 1
+            pixels[y1:y1 + self.cell_size - 1, x1:x1 + self.cell_size - 1] = parse_color(color)
+
+    def patch_cell(self, x, y, color):
+        """Recolor the inside of maze cell (x, y) in place, updating just its pixels on screen."""
+        self.patches.setdefault((x // PATCH_TILE, y // PATCH_TILE), {})[(x, y)] = color
+        if self.framebuffer is None:
+            return
+        self._patch_area(x, y, color)
+        view_x, view_y, cols, rows = self.view
+        if view_x <= x < view_x + cols and view_y <= y < view_y + rows:
+            x1, y1 = (x - view_x) * self.cell_size + 1, (y - view_y) * self.cell_size + 1
+            x2, y2 = x1 + self.cell_size - 2, y1 + self.cell_size - 2
+            self.framebuffer.fill_rect(x1, y1, x2, y2, color)
+            # Only the cell's pixels go to Tk; the rest of the image is unchanged
+            self.framebuffer.present_region(x1, y1, x2, y2)
+
+    def hide(self):
+        """Remove the layer's image from the window."""
+        if self.framebuffer is not None:
+            self.framebuffer.hide()
+            self.framebuffer = None
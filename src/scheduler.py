@@ -0,0 +1,74 @@
+import time
+from config import GameConfig
+
+
+class FrameScheduler:
+    """Paces the game loop at a target frame rate.
+
+    Game objects call mark_dirty when they change something on screen, and
+    the scheduler flushes the window once at the end of the frame.
+    Frames where nothing changed skip the flush and just wait until the
+    next frame is due, so an idle game uses almost no CPU.
+    """
+
+    def __init__(self, window, fps=None, input_queue=None):
+        """Create a scheduler for the given window.
+
+        With an InputQueue, waiting for the next frame returns as soon as
+        input arrives instead of sleeping through it.
+        """
+        self.window = window
+        self.input_queue = input_queue
+        self.frame_time = 1.0 / (fps or GameConfig.TARGET_FPS)
+        self.dirty = False
+        self.tasks = []  # [next_run, interval, func] for periodic work
+        self.next_frame = time.perf_counter() + self.frame_time
+        self.frame_count = 0
+        self.flush_count = 0
+
+    def mark_dirty(self):
+        """Record that something changed on screen this frame.
+
+        Tk repaints whatever its items touched, so there is no region to pass.
+        """
+        self.dirty = True
+
+    def every(self, interval, func):
+        """Run func every interval seconds, at the end of a frame."""
+        self.tasks.append([time.perf_counter() + interval, interval, func])
+
+    def _run_tasks(self):
+        """Run the periodic tasks that are due"""
+        now = time.perf_counter()
+        for task in self.tasks:
+            if now >= task[0]:
+                task[0] = now + task[1]
+                task[2]()
+
+    def end_frame(self):
+        """Run due tasks, flush the frame's changes and wait for the next frame.
+
+        Returns early when input arrives; the frame deadline is kept, so the
+        next call simply resumes waiting after the input is handled.
+        """
+        self._run_tasks()
+
+        if self.dirty:
+            self.window.update_idletasks()
+            self.dirty = False
+            self.flush_count += 1
+
+        delay = self.next_frame - time.perf_counter()
+        if delay > 0:
+            if self.input_queue:
+                self.input_queue.wait(delay)
+            else:
+                time.sleep(delay)
+
+        now = time.perf_counter()
+        if now >= self.next_frame:
+            self.frame_count += 1
+            self.next_frame += self.frame_time
+            if self.next_frame < now:
+                # Running behind (or resuming from a pause): don't try to catch up
+                self.next_frame = now + self.frame_time
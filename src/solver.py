@@ -0,0 +1,417 @@
+"""Shortest paths and distance fields over maze grids.
+
+Searches run on a flat copy of the grid with a wall border, so neighbours
+are found by adding a fixed offset and never need a bounds check. Per-cell
+data lives in array('i') buffers (4 bytes a cell) and the frontier is a
+deque of flat indices, so memory stays proportional to the grid even for
+mazes with millions of cells.
+"""
+from array import array
+from collections import deque
+
+import numpy as np
+from config import CellType
+
+WALL = CellType.WALL.value
+
+
+def _passable(cells):
+    """Flat 0/1 bytes of the open cells with a wall border, and the padded width."""
+    cells = np.asarray(cells, dtype=np.uint8)
+    rows, cols = cells.shape
+    open_cells = np.zeros((rows + 2, cols + 2), dtype=bool)
+    open_cells[1:-1, 1:-1] = cells != WALL
+    return open_cells.tobytes(), cols + 2
+
+
+def _cell_buffer(size, value=-1):
+    """array('i') of size cells, all set to value."""
+    return array("i", [value]) * size
+
+
+def _as_grid(buffer, rows, width):
+    """An array('i') over the padded grid as an int32 array shaped like the cells."""
+    flat = np.frombuffer(buffer, dtype=np.intc).astype(np.int32, copy=False)
+    return flat.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+
+
+def _bfs(passable, width, source, parents=None, order=None):
+    """Distances from flat index source to every cell (-1 if unreachable), as array('i').
+
+    If a parents buffer is given, it is filled with the cell each cell was
+    reached from; if an order array is given, the visited cells are
+    appended to it in visiting order.
+    """
+    dist = _cell_buffer(len(passable))
+    if not passable[source]:
+        return dist
+    dist[source] = 0
+
+    # Cells are crossed off a copy of passable as they are reached
+    unseen = bytearray(passable)
+    unseen[source] = 0
+    queue = deque([source])
+    visit, expand = queue.popleft, queue.append
+    while queue:
+        index = visit()
+        if order is not None:
+            order.append(index)
+        step = dist[index] + 1
+        for neighbour in (index - width, index + width, index - 1, index + 1):
+            if unseen[neighbour]:
+                unseen[neighbour] = 0
+                dist[neighbour] = step
+                expand(neighbour)
+                if parents is not None:
+                    parents[neighbour] = index
+    return dist
+
+
+def bfs_distances(cells, source):
+    """BFS step counts from source (x, y) to every cell of a 2D cell array.
+
+    Returns an int32 array shaped like cells, -1 where unreachable.
+    """
+    cells = np.asarray(cells)
+    rows = cells.shape[0]
+    passable, width = _passable(cells)
+    x, y = source
+    return _as_grid(_bfs(passable, width, (y + 1) * width + x + 1), rows, width)
+
+
+class DistanceField:
+    """Precomputed BFS distances from one target cell, for O(1) queries.
+
+    Built once per maze (usually towards END); hints and difficulty scoring
+    then look distances up instead of searching again.
+    """
+
+    def __init__(self, grid, target):
+        """Compute distances from every cell of grid to target (x, y)."""
+        self.target = tuple(target)
+        self.distances = bfs_distances(grid.cells if hasattr(grid, "cells") else grid, target)
+
+    def distance(self, x, y):
+        """Steps from (x, y) to the target, or -1 if it cannot be reached."""
+        return self.distances.item(y, x)
+
+    def reachable(self, x, y):
+        return self.distances.item(y, x) >= 0
+
+    def next_step(self, x, y):
+        """The (dx, dy) that takes (x, y) one step closer, or None."""
+        rows, cols = self.distances.shape
+        here = self.distances.item(y, x)
+        if here <= 0:
+            return None
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < cols and 0 <= ny < rows and self.distances.item(ny, nx) == here - 1:
+                return dx, dy
+        return None
+
+    def path_from(self, x, y):
+        """Shortest path from (x, y) to the target as a list of (x, y), or None."""
+        if not self.reachable(x, y):
+            return None
+        path = [(x, y)]
+        step = self.next_step(x, y)
+        while step:
+            x, y = x + step[0], y + step[1]
+            path.append((x, y))
+            step = self.next_step(x, y)
+        return path
+
+    def max_distance(self):
+        """Distance of the farthest reachable cell."""
+        return int(self.distances.max())
+
+    def reachable_count(self):
+        """Number of cells that can reach the target."""
+        return int(np.count_nonzero(self.distances >= 0))
+
+
+def shortest_path(grid, start=None, end=None):
+    """Shortest path from start to end (default START and END) as (x, y) list, or None."""
+    start = start or grid.find_start()
+    end = end or grid.find_end()
+    if start is None or end is None:
+        return None
+    return DistanceField(grid, end).path_from(*start)
+
+
+def bidirectional_path(grid, start=None, end=None):
+    """Shortest path found by searching from both ends at once.
+
+    Each side expands whole BFS layers, always the smaller frontier first,
+    and the search stops at the first layer where they meet. On big mazes
+    this visits far fewer cells than a full distance field.
+    Returns a list of (x, y) from start to end, or None.
+    """
+    start = start or grid.find_start()
+    end = end or grid.find_end()
+    if start is None or end is None:
+        return None
+
+    cells = grid.cells if hasattr(grid, "cells") else np.asarray(grid)
+    passable, width = _passable(cells)
+    source = (start[1] + 1) * width + start[0] + 1
+    target = (end[1] + 1) * width + end[0] + 1
+    if not (passable[source] and passable[target]):
+        return None
+
+    # parents[side][index]: where that side reached index from (-1 unseen)
+    parents = (_cell_buffer(len(passable)), _cell_buffer(len(passable)))
+    parents[0][source] = source
+    parents[1][target] = target
+    frontiers = [[source], [target]]
+    offsets = (-width, width, -1, 1)
+    meet = source if source == target else None
+
+    while meet is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, theirs = parents[side], parents[1 - side]
+        layer = []
+        for index in frontiers[side]:
+            for offset in offsets:
+                neighbour = index + offset
+                if passable[neighbour] and mine[neighbour] < 0:
+                    mine[neighbour] = index
+                    if theirs[neighbour] >= 0:
+                        meet = neighbour
+                        break
+                    layer.append(neighbour)
+            if meet is not None:
+                break
+        frontiers[side] = layer
+
+    if meet is None:
+        return None
+
+    def walk(parent, index):
+        cells_on_path = []
+        while True:
+            cells_on_path.append((index % width - 1, index // width - 1))
+            if parent[index] == index:
+                return cells_on_path
+            index = parent[index]
+
+    forward = walk(parents[0], meet)[::-1]
+    return forward + walk(parents[1], meet)[1:]
+
+
+def validate_maze(grid, reachable=None):
+    """Check a generated maze; returns a list of problems (empty when valid).
+
+    The maze needs exactly one START and one END, a path between them, and
+    every coin reachable from START. reachable, a boolean array of the
+    cells reachable from START, saves the search if the caller has one.
+    """
+    problems = []
+    for cell_type in (CellType.START, CellType.END):
+        count = grid.count(cell_type)
+        if count != 1:
+            problems.append(f"expected one {cell_type.name}, found {count}")
+    if problems:
+        return problems
+
+    if reachable is None:
+        reachable = DistanceField(grid, grid.find_start()).distances >= 0
+    end = grid.find_end()
+    if not reachable[end[1], end[0]]:
+        problems.append(f"END {end} is not reachable from START")
+    unreachable = [(int(x), int(y)) for x, y in grid.find(CellType.COIN).tolist()
+                   if not reachable[y, x]]
+    if unreachable:
+        problems.append(f"{len(unreachable)} coin(s) unreachable: {unreachable[:5]}")
+    return problems
+
+
+def maze_metrics(grid, field=None):
+    """Numbers for ranking mazes by difficulty without playing them.
+
+    field is the distance field towards END, computed if not given.
+    """
+    field = field or DistanceField(grid, grid.find_end())
+    start = grid.find_start()
+    open_cells = grid.cells != WALL
+
+    # Open neighbours of each open cell, from shifted copies of the grid
+    padded = np.pad(open_cells, 1)
+    neighbours = (padded[:-2, 1:-1].astype(np.int8) + padded[2:, 1:-1] +
+                  padded[1:-1, :-2] + padded[1:-1, 2:])
+    dead_ends = int(np.count_nonzero(open_cells & (neighbours == 1)))
+    junctions = int(np.count_nonzero(open_cells & (neighbours >= 3)))
+
+    solution = field.distance(*start) if start else -1
+    reachable = field.reachable_count()
+    return {
+        "solution_length": solution,
+        "reachable_cells": reachable,
+        "dead_ends": dead_ends,
+        "junctions": junctions,
+        "max_distance": field.max_distance(),
+        # Share of the maze the solution runs through; longer windier
+        # solutions with many dead ends read as harder
+        "solution_ratio": solution / reachable if reachable and solution > 0 else 0.0,
+    }
+
+
+def _flat(point, width):
+    """Flat index of (x, y) in the padded grid."""
+    return (point[1] + 1) * width + point[0] + 1
+
+
+def _is_tree(open_cells):
+    """True if the open cells form a perfect maze (connected, no loops).
+
+    Assumes the cells are connected, which validate_maze has checked.
+    """
+    edges = (np.count_nonzero(open_cells[:, 1:] & open_cells[:, :-1]) +
+             np.count_nonzero(open_cells[1:, :] & open_cells[:-1, :]))
+    return edges == np.count_nonzero(open_cells) - 1
+
+
+def detour_costs(grid, start=None, end=None):
+    """Extra steps a START -> END run needs to visit each cell and come back.
+
+    Uses one BFS from START: cells on the shortest path cost 0, and any
+    other cell costs twice its distance from where its branch leaves the
+    path. This is exact for perfect mazes (all our generators) and an upper
+    bound when the maze has loops. Returns an int32 array shaped like the
+    grid, -1 where unreachable, or None if START or END is missing or END
+    cannot be reached.
+    """
+    start = start or grid.find_start()
+    end = end or grid.find_end()
+    if start is None or end is None:
+        return None
+    cells = grid.cells
+    rows = cells.shape[0]
+    passable, width = _passable(cells)
+    source, target = _flat(start, width), _flat(end, width)
+
+    parents = _cell_buffer(len(passable))
+    dist = _bfs(passable, width, source, parents)
+    if dist[target] < 0:
+        return None
+
+    # Each cell's branch point on the solution path: path cells point to
+    # themselves, and pointer jumping (branch = branch[branch]) carries
+    # them down every branch in a logarithmic number of whole-array steps
+    branch = np.frombuffer(parents, dtype=np.intc)  # Shares the buffer, no copy
+    index = target
+    while index != source:
+        next_index = parents[index]
+        branch[index] = index
+        index = next_index
+    branch[source] = source
+    unreached = np.flatnonzero(branch < 0)
+    branch[unreached] = unreached
+    while True:
+        jumped = branch[branch]
+        if np.array_equal(jumped, branch):
+            break
+        branch = jumped
+
+    # detour = 2 * (dist - dist[branch]), built in place
+    dist = np.frombuffer(dist, dtype=np.intc)
+    detour = dist[branch].astype(np.int32, copy=False)
+    np.subtract(dist, detour, out=detour)
+    detour *= 2
+    detour[dist < 0] = -1
+    return detour.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+
+
+def pairwise_distances(grid, points):
+    """BFS distance matrix between points (one BFS per point)."""
+    passable, width = _passable(grid.cells)
+    flats = [_flat(point, width) for point in points]
+    matrix = np.empty((len(points), len(points)), dtype=np.int64)
+    for i, source in enumerate(flats):
+        dist = _bfs(passable, width, source)
+        matrix[i] = [dist[target] for target in flats]
+    return matrix
+
+
+def _steiner_tour(grid, start, end, points):
+    """Exact START -> all points -> END walk length in a perfect maze.
+
+    In a tree the best walk covers every edge of the subtree joining the
+    points twice, except the START -> END path, which is walked once.
+    """
+    passable, width = _passable(grid.cells)
+    source, target = _flat(start, width), _flat(end, width)
+    parents = _cell_buffer(len(passable))
+    order = array("i")
+    dist = _bfs(passable, width, source, parents, order)
+
+    # Walk the BFS order backwards, so every cell is seen after its children
+    needed = bytearray(len(passable))
+    for point in points:
+        needed[_flat(point, width)] = 1
+    needed[target] = 1
+    edges = 0
+    for index in reversed(order):
+        if needed[index] and index != source:
+            needed[parents[index]] = 1
+            edges += 1
+    return 2 * edges - dist[target]
+
+
+def _path_length(matrix, route):
+    return int(matrix[route[:-1], route[1:]].sum())
+
+
+def heuristic_tour(matrix):
+    """Order for visiting points 1..n-2 between fixed ends 0 and n-1.
+
+    Nearest neighbour from point 0, improved with 2-opt segment reversals
+    until no reversal shortens the route. Returns (length, route).
+    """
+    count = len(matrix)
+    route = [0]
+    unvisited = set(range(1, count - 1))
+    while unvisited:
+        last = route[-1]
+        nearest = min(unvisited, key=lambda point: matrix[last, point])
+        route.append(nearest)
+        unvisited.remove(nearest)
+    route.append(count - 1)
+    route = np.array(route)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, count - 2):
+            # Gain of reversing route[i:j+1] for every j at once
+            a, b = route[i - 1], route[i]
+            c, d = route[i + 1:count - 1], route[i + 2:count]
+            gain = matrix[a, b] + matrix[c, d] - matrix[a, c] - matrix[b, d]
+            best = int(np.argmax(gain))
+            if gain[best] > 0:
+                j = i + 1 + best
+                route[i:j + 1] = route[i:j + 1][::-1].copy()
+                improved = True
+    return _path_length(matrix, route), route.tolist()
+
+
+def collect_all_length(grid, coins=None, start=None, end=None):
+    """Moves needed to go from START to END collecting every coin (the par).
+
+    Exact for perfect mazes; otherwise a nearest neighbour + 2-opt tour over
+    pairwise BFS distances. Returns None if a point cannot be reached.
+    """
+    start = start or grid.find_start()
+    end = end or grid.find_end()
+    if coins is None:
+        coins = [tuple(point) for point in grid.find(CellType.COIN).tolist()]
+    coins = list(coins)
+
+    if validate_maze(grid):
+        return None
+    if _is_tree(grid.cells != WALL):
+        return _steiner_tour(grid, start, end, coins)
+
+    matrix = pairwise_distances(grid, [start] + coins + [end])
+    return heuristic_tour(matrix)[0]
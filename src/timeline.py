@@ -0,0 +1,123 @@
+"""Frame-driven tweens, so effects animate without blocking the game loop."""
+import time
+from collections import deque
+from config import GameConfig
+
+
+def lerp(start, end, t):
+    """Blend between two numbers (or tuples of numbers) by t in [0, 1]."""
+    if isinstance(start, tuple):
+        return tuple(a + (b - a) * t for a, b in zip(start, end))
+    return start + (end - start) * t
+
+
+class Tween:
+    """Animates one value through a list of (time, value) keyframes.
+
+    Each step hands the value for the current time to apply. With smooth
+    set, numbers and tuples of numbers are interpolated between keyframes;
+    otherwise (and always for colors or text) the value holds until the
+    next keyframe is reached. apply is only called when the value changes.
+    """
+
+    def __init__(self, keyframes, apply, on_done=None, delay=0, smooth=True):
+        self.keyframes = sorted(keyframes, key=lambda frame: frame[0])
+        self.apply = apply
+        self.on_done = on_done
+        self.delay = delay
+        self.smooth = smooth
+        self.duration = self.keyframes[-1][0]
+        self.start_time = None
+        self.value = None
+        self.done = False
+
+    def value_at(self, elapsed):
+        """Keyframe value at elapsed seconds into the tween."""
+        frames = self.keyframes
+        if elapsed <= frames[0][0]:
+            return frames[0][1]
+
+        for (t0, v0), (t1, v1) in zip(frames, frames[1:]):
+            if elapsed < t1:
+                if self.smooth and isinstance(v0, (int, float, tuple)):
+                    return lerp(v0, v1, (elapsed - t0) / (t1 - t0))
+                return v0
+        return frames[-1][1]
+
+    def step(self, now):
+        """Apply the value for now. Returns True once the tween has finished."""
+        if self.start_time is None:
+            self.start_time = now + self.delay
+        elapsed = now - self.start_time
+        if elapsed < 0:
+            return False
+
+        value = self.value_at(elapsed)
+        if value != self.value:
+            self.value = value
+            self.apply(value)
+        self.done = elapsed >= self.duration
+        return self.done
+
+
+class Timeline:
+    """Runs tweens from the game loop's frame tick.
+
+    tick() advances the running tweens round-robin and stops once the frame's
+    effect budget is spent. Tweens it did not reach go first on the next
+    frame; since tweens are timed, they just skip ahead, so a burst of effects
+    animates more coarsely instead of stalling input.
+    """
+
+    def __init__(self, budget=None):
+        """Create an empty timeline spending at most budget seconds per tick."""
+        self.budget = GameConfig.EFFECT_FRAME_BUDGET if budget is None else budget
+        self.tweens = deque()
+
+    def add(self, keyframes, apply, on_done=None, delay=0, smooth=True):
+        """Start a tween; see Tween for the arguments. Returns the tween."""
+        tween = Tween(keyframes, apply, on_done, delay, smooth)
+        self.tweens.append(tween)
+        return tween
+
+    def repeat(self, interval, count, func, on_done=None, delay=0):
+        """Call func(i) for i in range(count), one call every interval seconds."""
+        keyframes = [(i * interval, i) for i in range(count)]
+        return self.add(keyframes, func, on_done, delay, smooth=False)
+
+    def after(self, delay, func):
+        """Call func once, delay seconds from now."""
+        return self.add([(0, True)], lambda value: None, on_done=func, delay=delay)
+
+    def cancel(self, tween):
+        """Stop a tween without calling its on_done."""
+        if tween in self.tweens:
+            self.tweens.remove(tween)
+
+    def clear(self):
+        """Stop every tween."""
+        self.tweens.clear()
+
+    def tick(self, now=None):
+        """Advance the running tweens within the frame budget.
+
+        Returns the number of tweens stepped.
+        """
+        if now is None:
+            now = time.perf_counter()
+        deadline = time.perf_counter() + self.budget
+
+        stepped = 0
+        for _ in range(len(self.tweens)):
+            tween = self.tweens.popleft()
+            if not tween.step(now):
+                self.tweens.append(tween)
+            elif tween.on_done:
+                tween.on_done()
+            stepped += 1
+            if time.perf_counter() >= deadline:
+                break
+        return stepped
+
+    def __len__(self):
+        return len(self.tweens)
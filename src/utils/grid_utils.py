@@ -0,0 +1,94 @@
+import numpy as np
+from config import CellType
+
+
+class MazeGrid:
+    """Maze cells stored in a compact uint8 NumPy array (one byte per cell).
+
+    Indexing by row still works like the old list of lists, so
+    ``grid[y][x]`` reads and writes cells as before.
+    """
+
+    def __init__(self, cells):
+        """Wrap a 2D array-like of cell values."""
+        self.cells = np.asarray(cells, dtype=np.uint8)
+
+    @classmethod
+    def from_buffer(cls, buffer, rows, cols):
+        """Wrap a flat row-major buffer of cells without copying it."""
+        cells = np.frombuffer(buffer, dtype=np.uint8, count=rows * cols)
+        return cls(cells.reshape(rows, cols))
+
+    @property
+    def rows(self):
+        return self.cells.shape[0]
+
+    @property
+    def cols(self):
+        return self.cells.shape[1]
+
+    def __len__(self):
+        return self.cells.shape[0]
+
+    def __getitem__(self, row):
+        """Return one row as a writable view, like maze_array[y]."""
+        return self.cells[row]
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def tolist(self):
+        """Return the cells as a list of lists of ints."""
+        return self.cells.tolist()
+
+    def in_bounds(self, x, y):
+        """Check if (x, y) lies inside the grid"""
+        return 0 <= x < self.cells.shape[1] and 0 <= y < self.cells.shape[0]
+
+    def focus(self, x, y):
+        """A fixed grid is always fully loaded (see ChunkedMaze.focus)."""
+
+    def region(self, x, y, width, height):
+        """Return the (height, width) block of cells starting at (x, y), as a view."""
+        return self.cells[y:y + height, x:x + width]
+
+    def get(self, x, y):
+        """Return the cell value at (x, y) as a plain int."""
+        return self.cells.item(y, x)
+
+    def set(self, x, y, value):
+        """Set the cell value at (x, y)."""
+        self.cells[y, x] = value
+
+    def find(self, cell_type):
+        """Return an (N, 2) array of (x, y) positions holding cell_type."""
+        ys, xs = np.nonzero(self.cells == cell_type.value)
+        return np.column_stack((xs, ys))
+
+    def find_first(self, cell_type):
+        """Return the first (x, y) holding cell_type in row-major order, or None."""
+        flat = np.flatnonzero(self.cells == cell_type.value)
+        if flat.size == 0:
+            return None
+        y, x = divmod(int(flat[0]), self.cells.shape[1])
+        return (x, y)
+
+    def find_start(self):
+        """Return the START position, or None."""
+        return self.find_first(CellType.START)
+
+    def find_end(self):
+        """Return the END position, or None."""
+        return self.find_first(CellType.END)
+
+    def empty_cells(self):
+        """Return an (N, 2) array of (x, y) positions of plain path cells."""
+        return self.find(CellType.PATH)
+
+    def count(self, cell_type):
+        """Count cells of the given type."""
+        return int(np.count_nonzero(self.cells == cell_type.value))
+
+    def count_walls(self):
+        """Count wall cells."""
+        return self.count(CellType.WALL)
@@ -0,0 +1,18 @@
+from chunks import ChunkedMaze
+from config import CellType
+from game_state import GameState
+
+
+def test_collected_coin_stays_gone_after_eviction():
+    maze = ChunkedMaze(seed=7, chunk_size=8, keep_radius=1, coins_per_chunk=3)
+    ys, xs = (maze.chunk(0, 0).cells == CellType.COIN.value).nonzero()
+    x, y = int(xs[0]), int(ys[0])
+
+    state = GameState(maze)
+    assert state.collect_coin(x, y)
+
+    # Walk far enough away for chunk (0, 0) to be evicted, then come back
+    maze.focus(100, 100)
+    assert (0, 0) not in maze.chunks
+    assert maze.get(x, y) == CellType.PATH.value
+    assert not state.collect_coin(x, y)
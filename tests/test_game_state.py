@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from game_state import add_coins, build_maze, simulate_games
+from generators import GENERATORS
+from solver import detour_costs, validate_maze
+from utils.grid_utils import MazeGrid
+
+
+@pytest.mark.parametrize("algorithm", sorted(GENERATORS))
+def test_too_small_maze_raises_value_error(algorithm):
+    # On 3x3 the END fallback lands on START, so no attempt can be valid
+    with pytest.raises(ValueError):
+        build_maze(3, 3, algorithm, rng=random.Random(1))
+
+
+@pytest.mark.parametrize("algorithm", sorted(GENERATORS))
+def test_small_maze_builds(algorithm):
+    grid, coins = build_maze(5, 5, algorithm, coin_count=2, rng=random.Random(1))
+    assert grid.find_start() is not None and grid.find_end() is not None
+    assert len(coins) == 2
+
+
+def test_no_start_has_no_detour_costs():
+    grid = MazeGrid([[1, 1, 1], [1, 0, 1], [1, 1, 1]])
+    assert detour_costs(grid) is None
+    assert add_coins(grid, 3) == []
+
+
+@pytest.mark.parametrize("algorithm", sorted(GENERATORS))
+def test_unvalidated_maze_is_still_valid(algorithm):
+    # validate=False relies on the generators carving perfect mazes
+    grid, coins = build_maze(21, 31, algorithm, coin_count=10, rng=random.Random(3),
+                             validate=False)
+    assert len(coins) == 10
+    assert validate_maze(grid) == []
+
+
+def test_simulate_games_counts_every_game():
+    summary = simulate_games(5, max_moves=50, seed=2, rows=15, cols=15)
+    assert summary["games"] == 5
+    assert 0 < summary["moves"] <= 5 * 50
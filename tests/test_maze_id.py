@@ -0,0 +1,32 @@
+import pytest
+
+from game_state import build_from_spec, maze_spec
+from maze_id import MazeSpec, decode_maze_id, encode_maze_id
+
+
+def test_large_seed_roundtrips_through_id():
+    spec = maze_spec(2**40 + 5, "easy", rows=11, cols=15)
+    decoded = decode_maze_id(encode_maze_id(spec))
+    assert decoded == spec
+
+    grid, coins = build_from_spec(spec)
+    rebuilt, rebuilt_coins = build_from_spec(decoded)
+    assert (grid.cells == rebuilt.cells).all()
+    assert coins == rebuilt_coins
+
+
+def test_unmasked_seed_is_not_encoded():
+    spec = maze_spec(5, "easy", rows=11, cols=15)._replace(seed=2**40 + 5)
+    with pytest.raises(ValueError):
+        encode_maze_id(spec)
+
+
+@pytest.mark.parametrize("spec", [
+    MazeSpec(1, "hard", "backtracker", 70000, 10, 5),
+    MazeSpec(1, "hard", "backtracker", 10, 70000, 5),
+    MazeSpec(1, "hard", "backtracker", 10, 10, 70000),
+    MazeSpec(-1, "hard", "backtracker", 10, 10, 5),
+])
+def test_out_of_range_spec_raises_value_error(spec):
+    with pytest.raises(ValueError):
+        encode_maze_id(spec)